@@ -114,6 +114,9 @@ class Server(QObject, QRunnable):
                  address:tuple[Optional[str], int]=("localhost", PORT)) -> None:
         QObject.__init__(self)
         QRunnable.__init__(self)
+        # The server is still referenced and emits signals after run()
+        # returned, so the pool must not delete it.
+        self.setAutoDelete(False)
 
         self.connToBuffer = {}
         self.connToAddr = {}
@@ -245,6 +248,9 @@ class Client(QObject, QRunnable):
         """
         QObject.__init__(self)
         QRunnable.__init__(self)
+        # The client is still referenced by the games and transformers after
+        # run() returned, so the pool must not delete it.
+        self.setAutoDelete(False)
 
         self.msgQueue: Queue[Event] = Queue()
         self.conn = socket.create_connection(address)
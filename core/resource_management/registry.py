@@ -9,9 +9,12 @@ from __future__ import annotations
 from typing import Union, Callable
 
 import os
+import logging
 
 from PySide6.QtCore import QObject, Signal
 
+module_logger = logging.getLogger(__name__)
+
 class Registry(QObject):
     """
     One registry for one type of assets.
@@ -32,11 +35,17 @@ class Registry(QObject):
         """
         Register an item with a name for app-wide access. This item can be a
         class which will be instantiated on createItem() or a function which
-        will be called.
+        will be called. Registering the same item under the same name again
+        does nothing. Registering a different item under a taken name
+        replaces the old item with a warning.
         """
         category, name = name.split(".")
         if category not in self._items:
             self._items[category] = {}
+        elif name in self._items[category]:
+            if self._items[category][name] is itemClass:
+                return
+            module_logger.warning("Replacing registered item %s.%s", category, name)
         self._items[category][name] = itemClass
         self.itemsChanged.emit(category)
         
@@ -1,36 +1,118 @@
+from typing import Optional
+
+from queue import Queue, Empty, Full
+import threading
+
 import cv2
 import numpy as np
 
 from .IVideoSource import IVideoSource
 from .utils import NoMoreFrames
 
+# The number of decoded frames that are kept ready for the pipeline.
+FRAME_BUFFER_SIZE = 2
+
+# The timeout in seconds after which blocked reads and writes check whether
+# the source has been closed.
+FRAME_BUFFER_TIMEOUT = 0.1
+
 class CVVideoFileSource(IVideoSource):
     """
-    Video source that loads from a file.
+    Video source that loads from a file. Frames are decoded ahead on a reader
+    thread and kept in a bounded queue, so that decoding the next frame
+    overlaps with processing the current one.
+
+    If a frame stride greater than one is set, only every n-th frame is
+    decoded. The frames in between are grabbed from the container but never
+    retrieved, which skips their decoding into images.
+
+    frames - the decoded frames. None marks the end of the video.
+    frameStride - the number of frames to advance per returned frame. It is
+    fixed on construction, since only the reader thread may touch the
+    video capture.
     """
     videoCapture: cv2.VideoCapture
     originalFrameRate: int
+    frames: Queue[Optional[np.ndarray]]
+    frameStride: int
 
-    def __init__(self, filename: str) -> None:
+    def __init__(self, filename: str, frameStride: int = 1) -> None:
         self.videoCapture = cv2.VideoCapture(filename)
+        self.frameStride = max(1, frameStride)
         self.originalFrameRate = round(self.videoCapture.get(cv2.CAP_PROP_FPS))
+        self._width = int(self.videoCapture.get(cv2.CAP_PROP_FRAME_WIDTH))
+        self._height = int(self.videoCapture.get(cv2.CAP_PROP_FRAME_HEIGHT))
+
+        self.frames = Queue(maxsize=FRAME_BUFFER_SIZE)
+        self._ended = False
+        self._closed = threading.Event()
+        self._reader = threading.Thread(target=self._readFrames, daemon=True)
+        self._reader.start()
+
+    def _readFrames(self) -> None:
+        """
+        Decode frames until the end of the video is reached or the source is
+        closed. Blocks while the queue is full.
+        """
+        while not self._closed.is_set():
+            frame = self._retrieve() if self._grab() else None
+
+            while not self._closed.is_set():
+                try:
+                    self.frames.put(frame, timeout=FRAME_BUFFER_TIMEOUT)
+                    break
+                except Full:
+                    continue
+
+            if frame is None:
+                break
+
+    def _grab(self) -> bool:
+        """
+        Advance by frameStride frames without decoding the skipped ones.
+        Return False if the end of the video was reached.
+        """
+        for _ in range(self.frameStride):
+            if not self.videoCapture.grab():
+                return False
+        return True
+
+    def _retrieve(self) -> Optional[np.ndarray]:
+        """
+        Decode the most recently grabbed frame. Return None if it cannot be
+        decoded.
+        """
+        ret, frame = self.videoCapture.retrieve()
+        return frame if ret else None
 
     def frameRate(self) -> int:
-        return self.originalFrameRate
-    
+        return max(1, round(self.originalFrameRate / self.frameStride))
+
+    def droppedFrameRate(self) -> int:
+        return 0
+
     def width(self) -> int:
-        return int(self.videoCapture.get(cv2.CAP_PROP_FRAME_WIDTH))
+        return self._width
 
     def height(self) -> int:
-        return int(self.videoCapture.get(cv2.CAP_PROP_FRAME_HEIGHT))
+        return self._height
 
     def nextFrame(self) -> np.ndarray:
-        ret, frame = self.videoCapture.read()
+        while not self._ended:
+            try:
+                frame = self.frames.get(timeout=FRAME_BUFFER_TIMEOUT)
+            except Empty:
+                if self._closed.is_set():
+                    self._ended = True
+                continue
+
+            if frame is not None:
+                return frame
+            self._ended = True
+
+        raise NoMoreFrames
 
-        if ret:
-            return frame
-        else:
-            raise NoMoreFrames
-        
     def close(self) -> None:
+        self._closed.set()
+        self._reader.join()
         self.videoCapture.release()
@@ -1,5 +1,9 @@
 import logging
 
+from queue import Full, Queue
+from typing import Optional
+import threading
+
 import numpy as np
 import cv2
 
@@ -7,14 +11,27 @@ from .IVideoRecorder import IVideoRecorder
 
 module_logger = logging.getLogger(__name__)
 
+# The number of frames that may wait for encoding before addFrame waits.
+FRAME_QUEUE_SIZE = 8
+
+# The number of seconds addFrame waits for a free slot before the frame is
+# dropped, so that a stalled writer thread cannot block the pipeline forever.
+FRAME_QUEUE_TIMEOUT = 1.0
+
 class CVVideoRecorder(IVideoRecorder):
     """
     Light implementation of the video recorder by default
-    outputting to output.mp4.
+    outputting to output.mp4. Frames are encoded and written on a writer
+    thread, so that encoding does not stall the pipeline.
 
     recorder - the opencv video writer
+    frames - the frames waiting to be written. None marks the end of the video.
+    closed - whether the recorder is closed. Frames added afterwards are
+    dropped.
     """
     recorder: cv2.VideoWriter
+    frames: Queue[Optional[np.ndarray]]
+    closed: bool
 
     def __init__(self,
                  frameRate: int,
@@ -35,8 +52,42 @@ class CVVideoRecorder(IVideoRecorder):
                                         frameRate,
                                         (width, height))
 
+        self.frames = Queue(maxsize=FRAME_QUEUE_SIZE)
+        self.closed = False
+        self._writer = threading.Thread(target=self._writeFrames, daemon=True)
+        self._writer.start()
+
+    def _writeFrames(self) -> None:
+        """
+        Write frames until the end of the video is reached.
+        """
+        while True:
+            frame = self.frames.get()
+            if frame is None:
+                break
+            self.recorder.write(frame)
+
     def addFrame(self, image: np.ndarray) -> None:
-        self.recorder.write(image.astype(np.uint8))
+        if self.closed or not self._writer.is_alive():
+            return
+
+        try:
+            # astype copies, so the pipeline may keep modifying the image
+            self.frames.put(image.astype(np.uint8),
+                            timeout=FRAME_QUEUE_TIMEOUT)
+        except Full:
+            module_logger.warning("Dropped a frame, the video writer is stalled")
 
     def close(self) -> None:
-        self.recorder.release()
\ No newline at end of file
+        if self.closed:
+            return
+
+        self.closed = True
+        while self._writer.is_alive():
+            try:
+                self.frames.put(None, timeout=FRAME_QUEUE_TIMEOUT)
+                break
+            except Full:
+                pass
+        self._writer.join()
+        self.recorder.release()
@@ -1,12 +1,24 @@
+from typing import Optional
+
 import cv2
 import numpy as np
 
 from .IVideoSource import IVideoSource
 from .utils import FrameRateAccumulator
 
+# The number of frames the camera driver buffers. Keeping only one means the
+# pipeline always reads a fresh frame instead of a stale one when it lags.
+CAMERA_BUFFER_SIZE = 1
+
+# The pixel format requested from the camera. MJPG delivers full frame rates
+# at higher resolutions on most webcams, where raw YUYV is limited by USB
+# bandwidth.
+CAMERA_FOURCC = "MJPG"
+
 class CVVideoSource(IVideoSource):
     """
-    Video Source that grabs the first camera available to OpenCV.
+    Video Source that grabs the first camera available to OpenCV. The
+    driver's frame buffer is kept to a single frame to minimize latency.
 
     videoCapture - the video capture object from OpenCV
     """
@@ -17,6 +29,9 @@ class CVVideoSource(IVideoSource):
         Initialize the Video Capture by using the camera at index 0.
         """
         self.videoCapture = cv2.VideoCapture(0)
+        self.videoCapture.set(cv2.CAP_PROP_BUFFERSIZE, CAMERA_BUFFER_SIZE)
+        self.videoCapture.set(cv2.CAP_PROP_FOURCC,
+                              cv2.VideoWriter_fourcc(*CAMERA_FOURCC))
         self.frameRateAcc = FrameRateAccumulator()
 
     def nextFrame(self) -> np.ndarray:
@@ -37,6 +52,13 @@ class CVVideoSource(IVideoSource):
         
     def frameRate(self) -> int:
         return self.frameRateAcc.frameRate()
+
+    def droppedFrameRate(self) -> Optional[int]:
+        """
+        Frames are dropped inside the camera driver, where they cannot be
+        counted, so the number is unavailable.
+        """
+        return None
     
     def close(self) -> None:
         self.videoCapture.release()
\ No newline at end of file
@@ -1,4 +1,6 @@
 
+from typing import Optional
+
 import numpy as np
 
 from .utils import FrameRateAccumulator
@@ -32,6 +34,14 @@ class IVideoSource:
         Get the frame rate of the source.
         """
         raise NotImplementedError
+
+    def droppedFrameRate(self) -> Optional[int]:
+        """
+        Get the number of frames that were dropped in the previous second,
+        because a newer frame arrived before they could be processed. Return
+        None if the source cannot observe dropped frames.
+        """
+        raise NotImplementedError
     
     def close(self) -> None:
         """
@@ -1,5 +1,7 @@
 from typing import Optional
 
+import threading
+
 import numpy as np
 
 from PySide6.QtMultimedia import QCamera, QMediaCaptureSession, QVideoSink, QVideoFrame
@@ -8,11 +10,18 @@ from PySide6.QtCore import Slot
 from .IVideoSource import IVideoSource
 from .utils import FrameRateAccumulator, qImageToNpArray
 
+# The time in seconds to wait for a new frame from the camera before giving
+# up, so that a lost camera does not block the pipeline.
+FRAME_WAIT_TIMEOUT = 0.1
 
 class QVideoSource(IVideoSource):
     """
     Video Source that uses a cameras available via Qt. The camera must be set
-    via setCamera.
+    via setCamera. Only the most recent frame is kept, so the pipeline always
+    processes the newest frame. Frames replaced before they were processed are
+    counted as dropped. Reading a frame waits until the camera delivers one
+    that has not been processed yet, so the pipeline runs at the camera's
+    pace instead of processing the same frame repeatedly.
 
     camera - the camera from which frames are grabbed
     cameraSession - the media camera session
@@ -35,10 +44,15 @@ class QVideoSource(IVideoSource):
         self.cameraSession.setVideoSink(self.videoSink)
         self.camera = None
         self.videoFrame = None
+        self.videoFrameProcessed = True
         self.frameRateAcc = FrameRateAccumulator()
+        self._frameAvailable = threading.Condition()
     
     def frameRate(self) -> int:
         return self.frameRateAcc.frameRate()
+
+    def droppedFrameRate(self) -> int:
+        return self.frameRateAcc.droppedFrameRate()
     
     def width(self) -> int:
         return self.videoFrame.width() if self.videoFrame is not None else -1
@@ -48,21 +62,33 @@ class QVideoSource(IVideoSource):
 
     def nextFrame(self) -> np.ndarray:
         """
-        Retrieve the most recent frame available
+        Retrieve the most recent frame available. Wait for a new frame if the
+        most recent one has already been retrieved. Return None if no new
+        frame arrives within FRAME_WAIT_TIMEOUT.
         """
-        if self.videoFrame is not None:
-            self.frameRateAcc.onFrameReady()
-            image = self.videoFrame.toImage()        
-            return qImageToNpArray(image)
-        else:
-            return None
+        with self._frameAvailable:
+            if not self._frameAvailable.wait_for(
+                lambda: not self.videoFrameProcessed,
+                timeout=FRAME_WAIT_TIMEOUT):
+                return None
+            videoFrame = self.videoFrame
+            self.videoFrameProcessed = True
+
+        self.frameRateAcc.onFrameReady()
+        image = videoFrame.toImage()
+        return qImageToNpArray(image)
         
     @Slot(QVideoFrame)
     def setVideoFrame(self, videoFrame: QVideoFrame) -> None:
         """
-        Update the current video frame.
+        Update the current video frame and wake up a waiting reader.
         """
-        self.videoFrame = videoFrame
+        with self._frameAvailable:
+            if not self.videoFrameProcessed:
+                self.frameRateAcc.onFrameDropped()
+            self.videoFrame = videoFrame
+            self.videoFrameProcessed = False
+            self._frameAvailable.notify()
 
     @Slot(QCamera)
     def setCamera(self, camera: QCamera) -> None:
@@ -2,8 +2,9 @@
 Interfaces to work with videos.
 """
 
+from typing import Optional
+
 import numpy as np
-import tensorflow as tf
 
 from PySide6.QtGui import QImage
 from PySide6.QtCore import Slot, Signal, QObject, QTimer
@@ -18,17 +19,53 @@ def qImageToNpArray(image: QImage) -> np.ndarray:
 
     return image
 
-def npArrayToQImage(image: np.ndarray) -> QImage:
+def npArrayToQImage(image: np.ndarray,
+                    buffer: Optional[np.ndarray] = None) -> QImage:
     """
     Convert an ndarray with dimensions (height, width, channels) back
-    into a QImage.
+    into a QImage. The image is in QImage.Format.Format_RGB32, which can be
+    turned into a QPixmap without any format conversion.
+
+    buffer - an optional (height, width, 4) uint8 array created with
+    newQImageBuffer. The returned QImage is backed by it and is only valid
+    until the buffer is written again. If None, a new buffer is allocated.
     """
-    padding = [[0, 0], [0, 0], [0, 1]]
-    image = tf.pad(image, padding, constant_values=255).numpy()
-    buffer = image.astype(np.uint8).tobytes()
-    image = QImage(buffer, image.shape[1], image.shape[0], QImage.Format.Format_RGB32)
+    if buffer is None:
+        buffer = newQImageBuffer(image.shape[0], image.shape[1])
+    np.copyto(buffer[:, :, :3], image, casting="unsafe")
 
-    return image
+    return QImage(buffer.data,
+                  buffer.shape[1],
+                  buffer.shape[0],
+                  buffer.strides[0],
+                  QImage.Format.Format_RGB32)
+
+def npArrayAsQImage(image: np.ndarray) -> Optional[QImage]:
+    """
+    Wrap a C-contiguous uint8 ndarray with dimensions (height, width, 3) in a
+    QImage in QImage.Format.Format_BGR888 without copying. The channel order
+    matches npArrayToQImage. The QImage is only valid as long as the array
+    is not modified. Return None if the array cannot be wrapped.
+    """
+    if image.dtype != np.uint8 or image.ndim != 3 or image.shape[2] != 3 \
+        or not image.flags.c_contiguous:
+        return None
+
+    return QImage(image.data,
+                  image.shape[1],
+                  image.shape[0],
+                  image.strides[0],
+                  QImage.Format.Format_BGR888)
+
+def newQImageBuffer(height: int, width: int) -> np.ndarray:
+    """
+    Allocate a buffer that npArrayToQImage can write into. The padding
+    channel is filled once here instead of for every frame.
+    """
+    buffer = np.empty((height, width, 4), dtype=np.uint8)
+    buffer[:, :, 3] = 255
+
+    return buffer
 
 class NoMoreFrames(Exception):
     pass
@@ -42,6 +79,8 @@ class FrameRateAccumulator(QObject):
     frameRateUpdated = Signal(int)
     frameCount: int
     lastFrameRate: int
+    droppedFrameCount: int
+    lastDroppedFrameRate: int
 
     def __init__(self, baseFrameRate: int = 0) -> None:
         """
@@ -55,10 +94,15 @@ class FrameRateAccumulator(QObject):
 
         self.frameCount = 0
         self.lastFrameRate = baseFrameRate
+        self.droppedFrameCount = 0
+        self.lastDroppedFrameRate = 0
 
     def frameRate(self) -> int:
         return self.lastFrameRate
 
+    def droppedFrameRate(self) -> int:
+        return self.lastDroppedFrameRate
+
     @Slot()
     def onFrameReady(self) -> None:
         """
@@ -66,6 +110,14 @@ class FrameRateAccumulator(QObject):
         """
         self.frameCount += 1
 
+    @Slot()
+    def onFrameDropped(self) -> None:
+        """
+        Slot to be called whenever a frame is replaced by a newer one before
+        it could be processed.
+        """
+        self.droppedFrameCount += 1
+
     @Slot()
     def _onFrameRateUpdate(self) -> None:
         """
@@ -74,3 +126,5 @@ class FrameRateAccumulator(QObject):
         """
         self.lastFrameRate = self.frameCount
         self.frameCount = 0
+        self.lastDroppedFrameRate = self.droppedFrameCount
+        self.droppedFrameCount = 0
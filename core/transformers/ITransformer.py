@@ -40,12 +40,14 @@ class ITransformer:
     def next(self, frameData: FrameData) -> None:
         """
         Run the next stage in the pipeline. First acquire the lock of the next
-        stage before unlocking this stage.
+        stage before unlocking this stage. The timings record the stage itself
+        instead of its name, so that no string is built for every stage and
+        frame.
         """
         if "timings" not in frameData:
             frameData["timings"] = []
 
-        frameData["timings"].append((str(self), time.time()))
+        frameData["timings"].append((self, time.time()))
         if self._next is not None:
             self._next.flowLock()
         self.flowUnlock()
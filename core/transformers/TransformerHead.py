@@ -3,19 +3,21 @@ from __future__ import annotations
 
 from enum import Enum
 
-from PySide6.QtCore import QThreadPool
+from PySide6.QtCore import QThreadPool, QMutex
 from .ITransformer import ITransformer
 from .TransformerRunner import TransformerRunner
 
 
 class TransformerHead:
     """
-    The Transformer head managing the creation of new runners for the
-    transformer.
+    The Transformer head managing the runners for the transformer. Runners
+    are kept after they finished and are started again for later frames
+    instead of allocating a new runner for every frame.
     """
     _isRunning: bool
     _transformer: ITransformer
     _threadingModel: MultiThreading
+    _idleRunners: list[TransformerRunner]
 
     class MultiThreading(Enum):
         """
@@ -38,6 +40,8 @@ class TransformerHead:
         self._isRunning = False
         self._qThreadPool = qThreadPool
         self._threadingModel = threadingModel
+        self._idleRunners = []
+        self._runnersMutex = QMutex()
 
     def start(self) -> None:
         """
@@ -95,9 +99,31 @@ class TransformerHead:
 
     def startNext(self) -> None:
         """
-        Start the next TransformerRunner and connect to its signals.
+        Start the next TransformerRunner. An idle runner is reused if there is
+        one.
         """
-        runner = TransformerRunner(self._transformer)
-        runner.transformerStarted.connect(self.onStageCleared)
-        runner.transformerCompleted.connect(self.onTransformCompleted)
-        self._qThreadPool.start(runner)
\ No newline at end of file
+        self._qThreadPool.start(self._acquireRunner())
+
+    def _acquireRunner(self) -> TransformerRunner:
+        """
+        Take an idle runner or create a new one and connect to its signals.
+        """
+        self._runnersMutex.lock()
+        runner = self._idleRunners.pop() if len(self._idleRunners) > 0 else None
+        self._runnersMutex.unlock()
+
+        if runner is None:
+            runner = TransformerRunner(self._transformer)
+            runner.transformerStarted.connect(self.onStageCleared)
+            runner.transformerCompleted.connect(self.onTransformCompleted)
+            runner.runnerFinished.connect(self._releaseRunner)
+
+        return runner
+
+    def _releaseRunner(self, runner: TransformerRunner) -> None:
+        """
+        Mark the runner as idle so that it can be started again.
+        """
+        self._runnersMutex.lock()
+        self._idleRunners.append(runner)
+        self._runnersMutex.unlock()
@@ -1,6 +1,4 @@
-
 from __future__ import annotations
-from typing import Optional
 
 import logging
 import importlib
@@ -8,7 +6,7 @@ import time
 
 from PySide6.QtCore import QRunnable, QObject, Signal
 from .ITransformer import ITransformer
-from .utils import FrameData
+from .utils import FrameData, FRAME_DATA_POOL
 
 module_logger = logging.getLogger(__name__)
 module_logger.setLevel(logging.DEBUG)
@@ -22,41 +20,46 @@ except ModuleNotFoundError:
 class TransformerRunner(QRunnable, QObject):
     """
     Runs the transformer and emits a signal when the next thread can start
-    execution.
+    execution. The runner is not deleted after running, so that it can be
+    started again for the next frame. Each run takes a frame data object
+    from the frame data pool.
     """
     transformerStarted = Signal(FrameData)
     transformerCompleted = Signal(FrameData)
+    runnerFinished = Signal(object)
     _transformer: ITransformer
 
-    def __init__(self, transformer: ITransformer, frameData: Optional[FrameData] = None) -> None:
+    def __init__(self, transformer: ITransformer) -> None:
         """
         Initialize the Runner with the transformer it should execute.
         """
         QRunnable.__init__(self)
         QObject.__init__(self)
-        if frameData is None:
-            frameData = FrameData()
+        self.setAutoDelete(False)
         self._transformer = transformer
-        self.frameData = frameData
 
     def run(self) -> None:
         """
         Acquire the lock of the transformer. As soon as the lock could be acquired,
         the stage cleared signal is emitted and the first transformer stage starts
-        executing.
+        executing. Once done, the runner announces that it can be reused.
         """
-        if pydevd is not None:
-            pydevd.settrace(suspend=False)
-            self.transform()
-        else:
-            try:
+        try:
+            if pydevd is not None:
+                pydevd.settrace(suspend=False)
                 self.transform()
-            except Exception as e:
-                module_logger.exception(e)
+            else:
+                try:
+                    self.transform()
+                except Exception as e:
+                    module_logger.exception(e)
+        finally:
+            self.runnerFinished.emit(self)
 
     def transform(self) -> None:
-        self.frameData["timings"] = [("Start", time.time())]
+        frameData = FRAME_DATA_POOL.acquire()
+        frameData["timings"] = [("Start", time.time())]
         self._transformer.flowLock()
-        self.transformerStarted.emit(self.frameData)
-        self._transformer.transform(self.frameData)
-        self.transformerCompleted.emit(self.frameData)
\ No newline at end of file
+        self.transformerStarted.emit(frameData)
+        self._transformer.transform(frameData)
+        self.transformerCompleted.emit(frameData)
@@ -5,14 +5,15 @@ the frame data object.
 
 from __future__ import annotations
 from collections import defaultdict
+from functools import lru_cache
 import logging
 import json
 from typing import Optional
 
 import io
 import csv
+import copy
 import numpy as np
-import tensorflow as tf
 import cv2
 import math
 from cvzone.SelfiSegmentationModule import SelfiSegmentation
@@ -23,9 +24,11 @@ from PySide6.QtGui import QImage
 
 from extensions.models.mediapipe import BlazePose
 from core.models.IModel import IModel
+from core.keypoint_sets.IKeyPointSet import IKeypointSet
 from core.resource_management.video.IVideoRecorder import IVideoRecorder
 from core.resource_management.video.IVideoSource import IVideoSource
-from core.resource_management.video.utils import npArrayToQImage, NoMoreFrames
+from core.resource_management.video.utils import npArrayToQImage, npArrayAsQImage, \
+    newQImageBuffer, NoMoreFrames
 from core.transformers.ITransformerStage import ITransformerStage
 from core.transformers.ITransformer import ITransformer
 from core.transformers.utils import FrameData
@@ -33,6 +36,37 @@ from core.transformers.utils import FrameData
 module_logger = logging.getLogger(__name__)
 module_logger.setLevel(logging.DEBUG)
 
+# The size of the thumbnails that are compared to detect unchanged frames.
+DETECTION_CACHE_THUMBNAIL_SIZE = (32, 32)
+
+# The mean absolute pixel difference between two thumbnails below which the
+# previous detection is reused.
+DETECTION_CACHE_THRESHOLD = 3.0
+
+# The number of consecutive frames the previous detection may be reused for
+# before the model is forced to run again.
+DETECTION_CACHE_MAX_REUSE = 10
+
+# The frame rate assumed by the One-Euro filter if the source reports none.
+ONE_EURO_DEFAULT_FRAME_RATE = 30
+
+
+def pixelCoordinates(keypoints: list[list[float]],
+                     width: int,
+                     height: int) -> np.ndarray:
+    """
+    Convert normalized (y, x, ...) keypoints into an Nx2 int32 array of (x, y)
+    pixel coordinates for drawing with OpenCV. All keypoints are converted at
+    once instead of one at a time. Only the first two values of each keypoint
+    are read, so keypoints of different lengths can be mixed.
+    """
+    if len(keypoints) == 0:
+        return np.empty((0, 2), dtype=np.int32)
+
+    coordinates = np.array([[kp[1], kp[0]] for kp in keypoints],
+                           dtype=np.float64)
+    return np.rint(coordinates * (width, height)).astype(np.int32)
+
     
 class ImageMirror(ITransformerStage):
     """
@@ -47,10 +81,16 @@ class ImageMirror(ITransformerStage):
     
     def transform(self, frameData: FrameData) -> None:
         """
-        Transform the image by flipping it.
+        Transform the image by flipping it into a buffer owned by the frame.
         """
         if self.active():
-            frameData.image = cv2.flip(frameData.image, 1)
+            image = frameData.image
+            if image is not None:
+                frameData.image = cv2.flip(image,
+                                           1,
+                                           dst=frameData.buffer(self,
+                                                                image.shape,
+                                                                image.dtype))
             for s in frameData.keypointSets:
                 for keypoint in s.getKeypoints():
                     keypoint[1] = 1.0 - keypoint[1]
@@ -102,10 +142,12 @@ class LandmarkDrawer(ITransformerStage):
         Transform the image by adding circles to highlight the landmarks.
         """
         if self.active() and not frameData.dryRun:
+            height = frameData.height()
+            width = frameData.width()
             for s in frameData.keypointSets:
-                for keypoint in s.getKeypoints():
-                    y = round(keypoint[0] * frameData.height())
-                    x = round(keypoint[1] * frameData.width())
+                for x, y in pixelCoordinates(s.getKeypoints(),
+                                             width,
+                                             height).tolist():
                     cv2.circle(frameData.image,
                                (x, y),
                                self.markerRadius,
@@ -156,37 +198,122 @@ class SkeletonDrawer(ITransformerStage):
     def transform(self, frameData: FrameData) -> None:
         """
         Transform the image by connectin the body joints with straight lines.
+        Each line of the skeleton is drawn as one polyline.
         """
         if self.active() and not frameData.dryRun:
+            height = frameData.height()
+            width = frameData.width()
             for s in frameData.keypointSets:
-                keypoints = s.getKeypoints()
+                coordinates = pixelCoordinates(s.getKeypoints(), width, height)
+                lines = [coordinates[l] for l in s.getSkeletonLinesBody()
+                         if len(l) > 1]
 
-                def getCoordinates(index: int) -> tuple[int, int]:
-                    return (round(frameData.width() * keypoints[index][1]),
-                            round(frameData.height() * keypoints[index][0]))
-                
-                def drawSequence(*args):
-                    for i in range(1, len(args)):
-                        cv2.line(frameData.image,
-                                getCoordinates(args[i - 1]),
-                                getCoordinates(args[i]),
-                                self.color,
-                                thickness=self.lineThickness)
-                        
-                for l in s.getSkeletonLinesBody():
-                    drawSequence(*l)
+                if len(lines) > 0:
+                    cv2.polylines(frameData.image,
+                                  lines,
+                                  False,
+                                  self.color,
+                                  thickness=self.lineThickness)
 
         self.next(frameData)
     
     def __str__(self) -> str:
         return "Skeleton"
     
+@lru_cache(maxsize=8)
+def padTransform(width: int,
+                 height: int,
+                 targetWidth: int,
+                 targetHeight: int,
+                 mirror: bool = False) -> tuple[np.ndarray, tuple[int, int, int, int]]:
+    """
+    Return the affine transform that scales an image of the given dimensions
+    to fit into the target dimensions while keeping the aspect ratio, and the
+    region (x, y, width, height) of the target it is centered in. The
+    transform maps into the region's own coordinates. If mirror is True, the
+    result is also flipped horizontally, exactly like cv2.flip on the scaled
+    image. The transform only depends on the dimensions, which rarely change
+    between frames, so it is cached. The cached array is shared by all
+    callers and is therefore read-only.
+    """
+    ratio = max(width / targetWidth, height / targetHeight)
+    resizedWidth = max(1, min(targetWidth, int(width / ratio)))
+    resizedHeight = max(1, min(targetHeight, int(height / ratio)))
+    scaleX = resizedWidth / width
+    scaleY = resizedHeight / height
+    x = (targetWidth - resizedWidth) // 2
+    y = (targetHeight - resizedHeight) // 2
+
+    # Map pixel centers like cv2.resize does
+    offsetX = 0.5 * scaleX - 0.5
+    offsetY = 0.5 * scaleY - 0.5
+
+    if mirror:
+        scaleX = -scaleX
+        offsetX = resizedWidth - 1 - offsetX
+        x = targetWidth - x - resizedWidth
+
+    transform = np.array([[scaleX, 0.0, offsetX],
+                          [0.0, scaleY, offsetY]], dtype=np.float32)
+    transform.setflags(write=False)
+
+    return transform, (x, y, resizedWidth, resizedHeight)
+
+def resizeWithPad(image: np.ndarray,
+                  targetWidth: int,
+                  targetHeight: int,
+                  out: Optional[np.ndarray] = None,
+                  mirror: bool = False) -> np.ndarray:
+    """
+    Resize the image to fit into the target dimensions while keeping the
+    aspect ratio and pad the remaining area with black, like
+    tf.image.resize_with_pad. The image is warped directly into its region of
+    the output, so every pixel is read once and no intermediate image is
+    needed. Samples beyond the image edge repeat the edge pixels like
+    cv2.resize does, instead of blending with black.
+
+    out - an optional array to write the result into. It must have the
+    target dimensions and the dtype and channels of the image.
+    mirror - whether to also flip the result horizontally in the same pass.
+    """
+    height, width = image.shape[:2]
+    transform, (x, y, w, h) = padTransform(width,
+                                           height,
+                                           targetWidth,
+                                           targetHeight,
+                                           mirror)
+
+    if out is None:
+        out = np.empty((targetHeight, targetWidth) + image.shape[2:],
+                       dtype=image.dtype)
+
+    region = out[y:y + h, x:x + w]
+    warped = cv2.warpAffine(image,
+                            transform,
+                            (w, h),
+                            dst=region,
+                            flags=cv2.INTER_LINEAR,
+                            borderMode=cv2.BORDER_REPLICATE)
+    if warped is not region:
+        region[...] = warped
+
+    out[:y] = 0
+    out[y + h:] = 0
+    out[y:y + h, :x] = 0
+    out[y:y + h, x + w:] = 0
+
+    return out
+
 class Scaler(ITransformerStage):
     """
-    Scales the image up.
+    Scales the image up. It can also mirror the image in the same pass, which
+    replaces a separate mirror stage before or after it.
+
+    mirrored - whether the image and keypoints are flipped horizontally
     """
     targetWidth: int
     targetHeight: int
+    mirrored: bool
 
     def __init__(self,
                  width: int,
@@ -199,6 +326,13 @@ class Scaler(ITransformerStage):
 
         self.targetWidth = width
         self.targetHeight = height
+        self.mirrored = False
+
+    def setMirrored(self, mirrored: bool) -> None:
+        """
+        Set whether the image and keypoints are flipped horizontally.
+        """
+        self.mirrored = mirrored
 
     def setTargetSize(self, targetSize: int) -> None:
         """
@@ -213,13 +347,25 @@ class Scaler(ITransformerStage):
         """
         if self.active():
             if not frameData.dryRun and frameData.image is not None:
-                frameData.image = tf.image.resize_with_pad(frameData.image,
+                image = frameData.image
+                out = frameData.buffer(self,
+                                       (self.targetHeight, self.targetWidth) \
+                                        + image.shape[2:],
+                                       image.dtype)
+                frameData.image = resizeWithPad(image,
                                                 self.targetWidth,
-                                                self.targetHeight).numpy()
+                                                self.targetHeight,
+                                                out,
+                                                self.mirrored)
             else:
                 frameData.setWidth(self.targetWidth)
                 frameData.setHeight(self.targetHeight)
 
+            if self.mirrored:
+                for s in frameData.keypointSets:
+                    for keypoint in s.getKeypoints():
+                        keypoint[1] = 1.0 - keypoint[1]
+
         self.next(frameData)
 
     def __str__(self) -> str:
@@ -228,9 +374,19 @@ class Scaler(ITransformerStage):
 
 class ModelRunner(ITransformerStage):
     """
-    Runs a model on the image and adds the keypoints to the list.
+    Runs a model on the image and adds the keypoints to the list. If reusing
+    detections is enabled and a frame barely differs from the last frame the
+    model ran on, the previous detection is reused instead, at most
+    DETECTION_CACHE_MAX_REUSE times in a row. It is off by default, because
+    slow movements can fall below the threshold and yield stale poses.
+
+    reuseDetections - whether detections are reused for unchanged frames
     """
     model: Optional[IModel]
+    reuseDetections: bool
+    _lastThumbnail: Optional[np.ndarray]
+    _lastKeypointSet: Optional[IKeypointSet]
+    _reuseCount: int
 
     def __init__(self,
                  previous: Optional[ITransformer] = None) -> None:
@@ -240,12 +396,59 @@ class ModelRunner(ITransformerStage):
         ITransformerStage.__init__(self, True, previous)
 
         self.model = None
+        self.reuseDetections = False
+        self.clearCache()
+
+    def setReuseDetections(self, reuseDetections: bool) -> None:
+        """
+        Set whether detections are reused for nearly unchanged frames.
+        """
+        self.reuseDetections = reuseDetections
+        self.clearCache()
 
     def setModel(self, model: IModel) -> None:
         """
         Set the model to bs used for detection.
         """
         self.model = model
+        self.clearCache()
+
+    def clearCache(self) -> None:
+        """
+        Forget the last detection so that the model runs on the next frame.
+        """
+        self._lastThumbnail = None
+        self._lastKeypointSet = None
+        self._reuseCount = 0
+
+    def detect(self, image: np.ndarray) -> IKeypointSet:
+        """
+        Detect the keypoints in the image or reuse the last detection if
+        enabled and the image is nearly identical to the last one the model
+        ran on.
+        """
+        if not self.reuseDetections:
+            return self.model.detect(image)
+
+        thumbnail = cv2.resize(image,
+                               DETECTION_CACHE_THUMBNAIL_SIZE,
+                               interpolation=cv2.INTER_AREA).astype(np.int16)
+
+        if self._lastThumbnail is not None \
+            and self._reuseCount < DETECTION_CACHE_MAX_REUSE \
+            and thumbnail.shape == self._lastThumbnail.shape \
+            and np.abs(thumbnail - self._lastThumbnail).mean() \
+                < DETECTION_CACHE_THRESHOLD:
+            self._reuseCount += 1
+            return copy.deepcopy(self._lastKeypointSet)
+
+        keypointSet = self.model.detect(image)
+        self._lastThumbnail = thumbnail
+        # Later stages modify keypoints in place, so keep an untouched copy
+        self._lastKeypointSet = copy.deepcopy(keypointSet)
+        self._reuseCount = 0
+
+        return keypointSet
 
     def transform(self, frameData: FrameData) -> None:
         """
@@ -254,7 +457,7 @@ class ModelRunner(ITransformerStage):
         """
         if self.active() and self.model is not None and not frameData.dryRun \
             and frameData.image is not None:
-            frameData.keypointSets.append(self.model.detect(frameData.image))
+            frameData.keypointSets.append(self.detect(frameData.image))
         
         self.next(frameData)
 
@@ -264,10 +467,18 @@ class ModelRunner(ITransformerStage):
 class CsvImporter(ITransformerStage):
     """
     Imports the keypoints frame by frame from a separate file. Currently only
-    supports BlazePose-type model keypoints.
+    supports BlazePose-type model keypoints. The whole file is parsed into an
+    array on the first imported frame, on the pipeline thread rather than the
+    ui thread. Importing a frame then only slices the array.
+
+    keypoints - all keypoints in the file, one row per keypoint. None until
+    the file has been parsed.
+    frameStride - the number of frames in the file to advance per imported
+    frame, matching a video source that skips frames.
     """
-    csvReader: Optional[csv._reader]
+    keypoints: Optional[np.ndarray]
     keypointCount: int
+    frameStride: int
 
     def __init__(self,
                  keypointCount: int,
@@ -277,15 +488,65 @@ class CsvImporter(ITransformerStage):
         """
         ITransformerStage.__init__(self, True, previous)
 
-        self.csvReader = None
+        self.keypoints = None
         self.keypointCount = keypointCount
+        self.frameStride = 1
+        self._file = None
+        self._index = 0
+
+    def setFrameStride(self, frameStride: int) -> None:
+        """
+        Set the number of frames in the file to advance per imported frame.
+        """
+        self.frameStride = max(1, frameStride)
 
     def setFile(self, file: Optional[io.TextIOBase]) -> None:
         """
-        Set the file that the csv should be read from.
-        The previous file is NOT closed.
+        Set the file that the csv should be read from. It is read completely
+        when the first frame is imported. The previous file is NOT closed.
         """
-        self.csvReader = iter(csv.reader(file)) if file is not None else None
+        self._file = file
+        self.keypoints = None
+        self._index = 0
+
+    def _readKeypoints(self) -> np.ndarray:
+        """
+        Read all keypoints from the file. Every row with values is kept in
+        place, so that frame boundaries stay aligned. Blank lines are ignored,
+        since CsvExporter never writes any. Rows that are shorter than the
+        first row, like a row truncated by an interrupted export, are padded
+        with zeros, longer rows are cut off, and values that cannot be parsed
+        are read as zero. If the file cannot be read at all, an empty array is
+        returned, so that all frames get zero keypoints.
+        """
+        rows = []
+        try:
+            for row in csv.reader(self._file):
+                if len(row) > 0:
+                    rows.append([self._parseValue(x) for x in row])
+        except (OSError, csv.Error) as e:
+            module_logger.warning("Could not read keypoints: %s", e)
+
+        if len(rows) == 0:
+            return np.empty((0, 3), dtype=np.float64)
+
+        width = len(rows[0])
+        keypoints = np.zeros((len(rows), width), dtype=np.float64)
+        for i, values in enumerate(rows):
+            values = values[:width]
+            keypoints[i, :len(values)] = values
+        return keypoints
+
+    @staticmethod
+    def _parseValue(value: str) -> float:
+        """
+        Parse a single value of the file, reading it as zero if it is not a
+        number.
+        """
+        try:
+            return float(value)
+        except ValueError:
+            return 0.0
 
     def transform(self, frameData: FrameData) -> None:
         """
@@ -293,14 +554,17 @@ class CsvImporter(ITransformerStage):
         transformer is active and the file is set.
         """
         if self.active() \
-            and self.csvReader is not None \
+            and self._file is not None \
                 and not frameData.dryRun:
-            keypoints = []
-            for _ in range(self.keypointCount):
-                try:
-                    keypoints.append([float(x) for x in next(self.csvReader)])
-                except StopIteration:
-                    keypoints.append([0.0, 0.0, 0.0])
+            if self.keypoints is None:
+                self.keypoints = self._readKeypoints()
+
+            end = self._index + self.keypointCount
+            keypoints = self.keypoints[self._index:end].tolist()
+            self._index += self.keypointCount * self.frameStride
+
+            for _ in range(self.keypointCount - len(keypoints)):
+                keypoints.append([0.0] * self.keypoints.shape[1])
 
             frameData.keypointSets.append(BlazePose.KeypointSet(keypoints))
         
@@ -310,59 +574,71 @@ class CsvImporter(ITransformerStage):
         return "Importer"
 
 
-class QImageProvider(ITransformerStage, QObject):
+class PreviewProvider(ITransformerStage, QObject):
     """
-    Emits a signal with the np.ndarray image converted to a QImage.
+    Emits one signal with the np.ndarray image converted to a QImage together
+    with the frame data, so that only one signal per frame has to cross into
+    the ui thread.
+    The QImage is built on the pipeline thread, while turning it into a
+    QPixmap is left to the receiver in the ui thread, so that the upload of
+    one frame overlaps with the processing of the next.
+
+    previewFormat - the format of the emitted QImage. The frame data image is
+    not affected by it.
+    _buffer - the buffer the image is converted into if it cannot be wrapped
+    directly. It is reused for every frame of the same size.
     """
-    frameReady = Signal(QImage)
+    frameReady = Signal(object, FrameData)
+    previewFormat: QImage.Format
+    _buffer: Optional[np.ndarray]
 
-    def __init__(self, previous: Optional[ITransformer] = None) -> None:
+    def __init__(self,
+                 previewFormat: QImage.Format = QImage.Format.Format_RGB32,
+                 previous: Optional[ITransformer] = None) -> None:
         """
-        Initialize the image provider
+        Initialize the preview provider
         """
         ITransformerStage.__init__(self, True, previous)
         QObject.__init__(self)
 
-    def transform(self, frameData: FrameData) -> None:
-        """
-        Convert the image into a QImage and emit it with the signal.
-        """
-        if self.active():
-            if frameData.image is not None:
-                qImage = npArrayToQImage(frameData.image)
-            else:
-                qImage = None
-            self.frameReady.emit(qImage)
-
-        self.next(frameData)
-
-    def __str__(self) -> str:
-        return "Preview Image Provder"
-
-class FrameDataProvider(ITransformerStage, QObject):
-    """
-    Emits a signal with the np.ndarray image converted to a QImage.
-    """
-    frameDataReady = Signal(FrameData)
+        self.previewFormat = previewFormat
+        self._buffer = None
 
-    def __init__(self, previous: Optional[ITransformer] = None) -> None:
+    def setPreviewFormat(self, previewFormat: QImage.Format) -> None:
         """
-        Initialize the image provider
+        Set the format of the emitted QImage. A format with fewer bytes per
+        pixel makes the preview cheaper to copy and display.
         """
-        ITransformerStage.__init__(self, True, previous)
-        QObject.__init__(self)
+        self.previewFormat = previewFormat
 
     def transform(self, frameData: FrameData) -> None:
         """
-        Convert the image into a QImage and emit it with the signal.
+        Convert the image into a QImage and emit it with the frame data.
         """
         if self.active():
-            self.frameDataReady.emit(frameData)
+            if frameData.image is not None:
+                qImage = npArrayAsQImage(frameData.image)
+                if qImage is None:
+                    height, width = frameData.image.shape[:2]
+                    if self._buffer is None \
+                        or self._buffer.shape[:2] != (height, width):
+                        self._buffer = newQImageBuffer(height, width)
+                    qImage = npArrayToQImage(frameData.image, self._buffer)
+
+                # Both the frame and the buffer may be written again after
+                # this stage, so the emitted image must not share their memory
+                if qImage.format() != self.previewFormat:
+                    qImage = qImage.convertToFormat(self.previewFormat)
+                else:
+                    qImage = qImage.copy()
+            else:
+                qImage = None
+            self.frameReady.emit(qImage, frameData)
 
         self.next(frameData)
 
     def __str__(self) -> str:
-        return "Frame Data Provider"
+        return "Preview Provider"
 
 class RecorderTransformer(ITransformerStage):
     """
@@ -464,6 +740,9 @@ class VideoSourceTransformer(ITransformerStage, QObject):
         """
         if self.videoSource is not None:
             frameData.frameRate = self.videoSource.frameRate()
+            droppedFrames = self.videoSource.droppedFrameRate()
+            if droppedFrames is not None:
+                frameData["dropped_frames"] = droppedFrames
             frameData.setWidth(self.videoSource.width())
             frameData.setHeight(self.videoSource.height())
             if self.active() and not frameData.dryRun:
@@ -554,11 +833,12 @@ class SlidingAverageTransformer(ITransformerStage):
         metrics = frameData["metrics"]
         
         for key in metrics:
-            while len(self._metrics[key]) >= self.sequenceLength:
-                self._metrics[key].pop(0)
-            self._metrics[key].append(metrics[key])
+            values = self._metrics[key]
+            if len(values) >= self.sequenceLength:
+                del values[:len(values) - self.sequenceLength + 1]
+            values.append(metrics[key])
             if active:
-                metrics[key] = sum(self._metrics[key]) / len(self._metrics[key])
+                metrics[key] = sum(values) / len(values)
 
         self.next(frameData)
 
@@ -601,6 +881,102 @@ class ButterworthTransformer(ITransformerStage):
 
         self.next(frameData)
 
+class OneEuroFilter(ITransformerStage):
+    """
+    Smoothes the keypoint positions over time with a One-Euro filter. Slow
+    movements are smoothed strongly to remove jitter, while fast movements
+    raise the cutoff frequency to keep the lag low. All keypoints of a set
+    are filtered at once.
+
+    minCutoff - the cutoff frequency in Hz for a resting keypoint
+    beta - how much the cutoff frequency grows with the keypoint's speed
+    derivativeCutoff - the cutoff frequency in Hz for the speed estimate
+    """
+    minCutoff: float
+    beta: float
+    derivativeCutoff: float
+    _states: list[Optional[tuple[np.ndarray, np.ndarray]]]
+
+    def __init__(self,
+                 minCutoff: float = 1.0,
+                 beta: float = 1.0,
+                 derivativeCutoff: float = 1.0,
+                 previous: Optional[ITransformer] = None) -> None:
+        """
+        Initialize it.
+        """
+        ITransformerStage.__init__(self, True, previous)
+
+        self.minCutoff = minCutoff
+        self.beta = beta
+        self.derivativeCutoff = derivativeCutoff
+        self._states = []
+
+    def setMinCutoff(self, minCutoff: float) -> None:
+        """
+        Set the cutoff frequency in Hz for a resting keypoint.
+        """
+        self.minCutoff = minCutoff
+
+    def setBeta(self, beta: float) -> None:
+        """
+        Set how much the cutoff frequency grows with the keypoint's speed.
+        """
+        self.beta = beta
+
+    @staticmethod
+    def smoothingFactor(cutoff: np.ndarray | float, dt: float) -> np.ndarray | float:
+        """
+        Return the weight of the new value in an exponential smoothing step
+        with the given cutoff frequency and time step.
+        """
+        tau = 1.0 / (2 * math.pi * cutoff)
+        return 1.0 / (1.0 + tau / dt)
+
+    def transform(self, frameData: FrameData) -> None:
+        """
+        Replace the keypoint positions with their filtered values.
+        """
+        if self.active() and not frameData.dryRun:
+            frameRate = frameData.frameRate if frameData.frameRate > 0 \
+                else ONE_EURO_DEFAULT_FRAME_RATE
+            dt = 1.0 / frameRate
+
+            setCount = len(frameData.keypointSets)
+            self._states = self._states[:setCount] \
+                + [None] * (setCount - len(self._states))
+
+            for i, s in enumerate(frameData.keypointSets):
+                keypoints = s.getKeypoints()
+                if len(keypoints) == 0:
+                    continue
+                positions = np.array([[kp[0], kp[1]] for kp in keypoints],
+                                     dtype=np.float64)
+
+                state = self._states[i]
+                if state is None or state[0].shape != positions.shape:
+                    self._states[i] = (positions, np.zeros_like(positions))
+                    continue
+
+                lastPositions, lastSpeeds = state
+                speeds = (positions - lastPositions) / dt
+                alpha = self.smoothingFactor(self.derivativeCutoff, dt)
+                speeds = alpha * speeds + (1 - alpha) * lastSpeeds
+
+                cutoff = self.minCutoff + self.beta * np.abs(speeds)
+                alpha = self.smoothingFactor(cutoff, dt)
+                positions = alpha * positions + (1 - alpha) * lastPositions
+                self._states[i] = (positions, speeds)
+
+                for keypoint, (y, x) in zip(keypoints, positions.tolist()):
+                    keypoint[0] = y
+                    keypoint[1] = x
+
+        self.next(frameData)
+
+    def __str__(self) -> str:
+        return "One-Euro Filter"
+
 class MinMaxTransformer(ITransformerStage, QObject):
     metrics: Optional[dict[str, list[float]]]
     _min: dict[str, float]
@@ -1,4 +1,6 @@
 from typing import Optional
+from collections import deque
+from weakref import WeakKeyDictionary
 
 import numpy as np
 
@@ -22,6 +24,10 @@ class FrameData:
     streamEnded - whether the stream of frames is ended.
     image - the image/frame that should be processed (if it exists).
     keypointSets - a list of all detected keypointSets.
+    _buffers - scratch arrays of the stages, keyed weakly by the stage that
+    owns them. They survive reset, so that stages can write into the same
+    memory again when the object is reused, and are dropped together with
+    their stage.
     """
     dryRun: bool
     _width: int
@@ -51,6 +57,39 @@ class FrameData:
         self.streamEnded = streamEnded
         self.keypointSets = keypointSets if keypointSets is not None else []
         self._additional = {}
+        self._buffers = WeakKeyDictionary()
+
+    def reset(self, dryRun: bool = False) -> None:
+        """
+        Reset the frame data object to the state of a newly created one, so
+        that it can be reused for another frame.
+        """
+        self.dryRun = dryRun
+        self.image = None
+        self._width = -1
+        self._height = -1
+        self.frameRate = -1
+        self.streamEnded = False
+        self.keypointSets.clear()
+        self._additional.clear()
+
+    def buffer(self,
+               owner: object,
+               shape: tuple[int, ...],
+               dtype: np.dtype) -> np.ndarray:
+        """
+        Return a scratch array with the given shape and dtype for the given
+        owner, usually the calling stage. The array belongs to this frame data
+        object only, so no other frame in the pipeline can write to it. It is
+        released once the owner is garbage collected. Its contents are
+        undefined.
+        """
+        buffer = self._buffers.get(owner)
+        if buffer is None or buffer.shape != shape or buffer.dtype != dtype:
+            buffer = np.empty(shape, dtype=dtype)
+            self._buffers[owner] = buffer
+
+        return buffer
 
     def width(self) -> int:
         """
@@ -98,4 +137,48 @@ class FrameData:
         """
         Check if a key is in the additional dictionary.
         """
-        return key in self._additional
\ No newline at end of file
+        return key in self._additional
+
+
+class FrameDataPool:
+    """
+    A pool of frame data objects that are reused across frames instead of
+    creating a new object for every frame. A frame data object must only be
+    released once no transformer or widget accesses it anymore. Dry runs take
+    their own object from the pool as well, so that two dry runs in flight at
+    the same time never share state.
+    Objects are reset when they are released, so that idle objects in the
+    pool do not keep the image and keypoints of their last frame alive. Their
+    scratch buffers are kept on purpose, so that the stages can reuse them
+    for the next frame. A buffer is only freed once its stage is gone.
+    """
+    _free: deque[FrameData]
+
+    def __init__(self) -> None:
+        """
+        Initialize the pool without any preallocated objects.
+        """
+        self._free = deque()
+
+    def acquire(self, dryRun: bool = False) -> FrameData:
+        """
+        Return a reset frame data object from the pool or create a new one
+        if the pool is empty.
+        """
+        try:
+            frameData = self._free.pop()
+        except IndexError:
+            return FrameData(dryRun=dryRun)
+
+        frameData.dryRun = dryRun
+        return frameData
+
+    def release(self, frameData: FrameData) -> None:
+        """
+        Reset a frame data object and return it to the pool.
+        """
+        frameData.reset()
+        self._free.append(frameData)
+
+
+FRAME_DATA_POOL = FrameDataPool()
@@ -15,8 +15,9 @@ from core.transformers.ITransformer import ITransformer
 class TransformerWidget(QGroupBox):
     """
     The base transformer widget including the title label and remove logic.
+    The removed signal carries the widget that was removed.
     """
-    removed = Signal()
+    removed = Signal(QWidget)
 
     titleLabel: QLabel
     vLayout: QVBoxLayout
@@ -59,7 +60,7 @@ class TransformerWidget(QGroupBox):
         Called when the remove button is clicked.
         """
         self.close()
-        self.removed.emit()
+        self.removed.emit(self)
 
     def close(self) -> None:
         """
@@ -10,6 +10,7 @@ from collections import defaultdict
 from typing import Optional
 import logging
 
+import numpy as np
 import matplotlib
 matplotlib.use('QtAgg')
 
@@ -22,10 +23,28 @@ import PySide6
 import pyqtgraph as pg
 
 from PySide6.QtWidgets import QWidget, QVBoxLayout, QGridLayout
+from PySide6.QtCore import QTimer, Slot
 
 module_logger = logging.getLogger(__name__)
 module_logger.setLevel(logging.DEBUG)
 
+# The interval in ms in which collected metric values are drawn (~30 Hz).
+METRIC_UPDATE_INTERVAL = 33
+
+def writeRingBuffer(series: np.ndarray,
+                    index: int,
+                    values: np.ndarray,
+                    length: int) -> int:
+    """
+    Write the values into the doubled ring buffer series of the given length,
+    starting at index. Return the index after the last written value.
+    """
+    indices = (index + np.arange(len(values))) % length
+    series[indices] = values
+    series[indices + length] = values
+
+    return (index + len(values)) % length
+
 class MetricWidget:    
     """
     Interface for metric widgets. Metric widgets display metrics on the screen.
@@ -58,6 +77,13 @@ class MetricWidget:
         """
         raise NotImplementedError
 
+    def addValuesTo(self, key: str, values: np.ndarray) -> None:
+        """
+        Add multiple values to the graph to a specific series. The values
+        correspond to the y values of the next points in the timeline.
+        """
+        raise NotImplementedError
+
 class MetricWidgetGroup(QWidget):
     """
     Abstract class for a metric widget group. A metric widget group displays
@@ -104,8 +130,13 @@ class VetricalMetricWidgetGroup(MetricWidgetGroup):
 class GridMetricWidgetGroup(MetricWidgetGroup):
     """
     A metric widget group that displays the metric widgets vertically.
+    Incoming values are collected and drawn in batches every
+    METRIC_UPDATE_INTERVAL milliseconds instead of once per frame.
     """
     _metricViews: dict[str, MetricWidget]
+    _pendingValues: dict[tuple[str, str], list[float]]
+    _pendingMinimums: dict[str, float]
+    _pendingMaximums: dict[str, float]
 
     def __init__(self, parent: Optional[QWidget] = None) -> None:
         """
@@ -113,17 +144,26 @@ class GridMetricWidgetGroup(MetricWidgetGroup):
         """
         MetricWidgetGroup.__init__(self, parent)
         self._metricViews = {}
+        self._pendingValues = defaultdict(list)
+        self._pendingMinimums = {}
+        self._pendingMaximums = {}
 
         self.gridLayout = QGridLayout()
         self.setLayout(self.gridLayout)
 
+        self.updateTimer = QTimer(self)
+        self.updateTimer.setSingleShot(True)
+        self.updateTimer.setInterval(METRIC_UPDATE_INTERVAL)
+        self.updateTimer.timeout.connect(self.flushMetrics)
+
     def updateMetrics(self,
                       metrics: dict[str, list[float]],
                       minimumMetrics: Optional[dict[str, list[float]]] = None,
                       maximumMetrics: Optional[dict[str, list[float]]] = None,
                       derivativeMetrics: Optional[dict[str, list[float]]] = None) -> None:
        """
-       Update the metric views.
+       Collect the values for the metric views. They are drawn with the next
+       flush.
        """
        for col in metrics:
             if col not in self._metricViews:
@@ -132,25 +172,44 @@ class GridMetricWidgetGroup(MetricWidgetGroup):
                 self._metricViews[col] = widget
                 row = length % 3
                 column = length // 3
-                module_logger.debug(f"Adding metric view {col} at row {row} and column {column}")
+                if module_logger.isEnabledFor(logging.DEBUG):
+                    module_logger.debug("Adding metric view %s at row %d and column %d",
+                                        col, row, column)
                 self.gridLayout.addWidget(widget, row, column)
-            else:
-                widget = self._metricViews[col]
 
             if derivativeMetrics is not None and col in derivativeMetrics:
                 derivatives = derivativeMetrics[col]
-                self._metricViews[col].addValue(derivatives[0])
+                self._pendingValues[(col, "")].append(derivatives[0])
                 if len(derivatives) > 1:
-                    self._metricViews[col].addValueTo("speed", derivatives[1])
+                    self._pendingValues[(col, "speed")].append(derivatives[1])
                 if len(derivatives) > 2:
-                    self._metricViews[col].addValueTo("acceleration", derivatives[2])
+                    self._pendingValues[(col, "acceleration")].append(derivatives[2])
             else:
-                self._metricViews[col].addValue(metrics[col])
+                self._pendingValues[(col, "")].append(metrics[col])
 
             if minimumMetrics is not None and col in minimumMetrics:
-                self._metricViews[col].setMinimum(minimumMetrics[col])
+                self._pendingMinimums[col] = minimumMetrics[col]
             if maximumMetrics is not None and col in maximumMetrics:
-                self._metricViews[col].setMaximum(maximumMetrics[col])
+                self._pendingMaximums[col] = maximumMetrics[col]
+
+       if not self.updateTimer.isActive():
+           self.updateTimer.start()
+
+    @Slot()
+    def flushMetrics(self) -> None:
+        """
+        Draw all values that have been collected since the last flush.
+        """
+        for (col, key), values in self._pendingValues.items():
+            self._metricViews[col].addValuesTo(key, np.asarray(values))
+        for col, value in self._pendingMinimums.items():
+            self._metricViews[col].setMinimum(value)
+        for col, value in self._pendingMaximums.items():
+            self._metricViews[col].setMaximum(value)
+
+        self._pendingValues.clear()
+        self._pendingMinimums.clear()
+        self._pendingMaximums.clear()
     
 
 class MPLMetricWidget(MetricWidget, FigureCanvasQTAgg):
@@ -200,13 +259,16 @@ class PyQtMetricWidget(MetricWidget, pg.PlotWidget):
         self._maximumLine = None
         self.maxDataPoints = max_datapoints
         self.values = defaultdict(self.newSeries)
+        self._writeIndices = defaultdict(int)
 
-    def newSeries(self) -> tuple[list, pg.PlotDataItem]:
+    def newSeries(self) -> tuple[np.ndarray, pg.PlotDataItem]:
         """
-        Create a new time series for the plot.
+        Create a new time series for the plot. The series is stored twice in
+        a row in one ring buffer, so that the most recent maxDataPoints values
+        are always available as one contiguous view without copying.
         """
-        data = [0] * self.maxDataPoints
-        line = self.plot(data)
+        data = np.zeros(2 * self.maxDataPoints, dtype=np.float32)
+        line = self.plot(data[:self.maxDataPoints])
 
         return data, line
 
@@ -251,7 +313,28 @@ class PyQtMetricWidget(MetricWidget, pg.PlotWidget):
         the y value of the next point in the timeline.
         """
         series, line = self.values[key]
-        series.append(value)
-        series.pop(0)
-        line.setData(series)
-            
+        index = self._writeIndices[key]
+        series[index] = value
+        series[index + self.maxDataPoints] = value
+
+        index = (index + 1) % self.maxDataPoints
+        self._writeIndices[key] = index
+        line.setData(series[index:index + self.maxDataPoints])
+
+    def addValuesTo(self, key: str, values: np.ndarray) -> None:
+        """
+        Add multiple values at once to the graph for the named curve <key>.
+        The values correspond to the y values of the next points in the
+        timeline.
+        """
+        values = np.asarray(values, dtype=np.float32)[-self.maxDataPoints:]
+        if len(values) == 0:
+            return
+
+        series, line = self.values[key]
+        index = writeRingBuffer(series,
+                                self._writeIndices[key],
+                                values,
+                                self.maxDataPoints)
+        self._writeIndices[key] = index
+        line.setData(series[index:index + self.maxDataPoints])
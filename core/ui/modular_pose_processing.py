@@ -5,6 +5,8 @@ Author: Henrik Zimmermann <henrik.zimmermann@utoronto.ca>
 """
 
 from __future__ import annotations
+import os
+import threading
 import time
 from typing import Optional
 
@@ -13,26 +15,48 @@ import numpy as np
 
 from PySide6.QtWidgets import QWidget, QHBoxLayout, QPushButton, \
     QLabel, QVBoxLayout, QComboBox, QSizePolicy
-from PySide6.QtCore import Slot, Signal, QRunnable, QObject, QThreadPool, Qt
+from PySide6.QtCore import Slot, Signal, QRunnable, QObject, QThreadPool, Qt, \
+    QTimer
 from PySide6.QtGui import QPixmap, QImage, QCloseEvent
 
 from core.ui.metric_widgets import GridMetricWidgetGroup, MetricWidgetGroup
 from core.resource_management.registry import REGISTRY
 from core.ui.ITransformerWidget import TransformerWidget
-from core.transformers.utils import FrameData
+from core.transformers.utils import FrameData, FRAME_DATA_POOL
 from core.transformers.Pipeline import Pipeline
 from core.transformers.ITransformer import ITransformer
-from core.transformers.transformers import FrameDataProvider, QImageProvider, Scaler
+from core.transformers.transformers import PreviewProvider, Scaler
 from core.transformers.TransformerHead import TransformerHead
 
 module_logger = logging.getLogger(__name__)
 module_logger.setLevel(logging.DEBUG)
 
+# The interval in ms in which log messages are forwarded to the status bar.
+STATUS_FLUSH_INTERVAL = 100
+
+# The loggers of the application whose messages are shown in the status bar.
+# Records from third-party libraries logging to the root logger are not shown.
+STATUS_LOGGERS = ["__main__", "core", "extensions", "games"]
+
+# Preview images are already converted into their display format by the
+# pipeline thread, so the ui thread can skip conversion and alpha scanning.
+PIXMAP_CONVERSION_FLAGS = Qt.ImageConversionFlag.NoFormatConversion \
+    | Qt.ImageConversionFlag.NoOpaqueDetection
+
+# The maximum number of frames that are processed by the pipeline at once.
+PIPELINE_MAX_THREADS = 4
+
+# The interval in ms in which the frame rate and latency labels are updated.
+LABEL_UPDATE_INTERVAL = 1000
+
 class StatusLogHandler(QObject):
     """
     Log handler that makes the logged messages available to Qt slots.
+    Messages are coalesced so that at most one message is emitted every
+    STATUS_FLUSH_INTERVAL milliseconds. Only the most recent message is shown.
     """
     messageEmitted = Signal(str)
+    _messagePending = Signal()
 
     class Log(logging.Handler):
         def __init__(self, logHandler: StatusLogHandler) -> None:
@@ -41,7 +65,7 @@ class StatusLogHandler(QObject):
             self.setLevel(logging.INFO)
 
         def emit(self, record: logging.LogRecord) -> None:
-            self.logHandler.messageEmitted.emit(record.msg)
+            self.logHandler.post(record.getMessage())
     
     def __init__(self) -> None:
         """
@@ -49,6 +73,10 @@ class StatusLogHandler(QObject):
         """
         QObject.__init__(self)
         self._logHandler = StatusLogHandler.Log(self)
+        self._lock = threading.Lock()
+        self._message = None
+        self._messagePending.connect(self._scheduleFlush,
+                                     Qt.ConnectionType.QueuedConnection)
 
     def logHandler(self) -> StatusLogHandler.Log:
         """
@@ -56,6 +84,37 @@ class StatusLogHandler(QObject):
         """
         return self._logHandler
 
+    def post(self, message: str) -> None:
+        """
+        Store the message to be emitted with the next flush. Only the first
+        message since the last flush crosses over to the Qt event loop.
+        """
+        with self._lock:
+            isPending = self._message is not None
+            self._message = message
+
+        if not isPending:
+            self._messagePending.emit()
+
+    @Slot()
+    def _scheduleFlush(self) -> None:
+        """
+        Flush the pending message after the flush interval has passed.
+        """
+        QTimer.singleShot(STATUS_FLUSH_INTERVAL, self._flush)
+
+    @Slot()
+    def _flush(self) -> None:
+        """
+        Emit the most recent message.
+        """
+        with self._lock:
+            message = self._message
+            self._message = None
+
+        if message is not None:
+            self.messageEmitted.emit(message)
+
 
 class PipelineWidget(QWidget):
     """
@@ -73,14 +132,12 @@ class PipelineWidget(QWidget):
         self.hLayout = QHBoxLayout()
         self.setLayout(self.hLayout)
 
-        self.frameDataProvider = FrameDataProvider()
-        self.imageProvider = QImageProvider()
+        # The preview is small, 16 bit colors halve the bytes to display.
+        self.previewProvider = PreviewProvider(QImage.Format.Format_RGB16)
         self.scaler = Scaler(400, 400)
-        self.qThreadPool = QThreadPool.globalInstance()
         self._pipeline = Pipeline()
         self._pipeline.setNextTransformer(self.scaler)
-        self.scaler.setNextTransformer(self.imageProvider)
-        self.imageProvider.setNextTransformer(self.frameDataProvider)
+        self.scaler.setNextTransformer(self.previewProvider)
 
         self.hTransformerLayout = QHBoxLayout()
         self.hLayout.addLayout(self.hTransformerLayout)
@@ -89,15 +146,24 @@ class PipelineWidget(QWidget):
         self.hLayout.addWidget(self.transformerSelector)
 
         self.addButton = QPushButton("Add Transformer", self)
-        self.addButton.clicked.connect(lambda: self.onAdd(self.transformerSelector.currentText()))
+        self.addButton.clicked.connect(self.onAddClicked)
         self.hLayout.addWidget(self.addButton)
 
         self.hLayout.addStretch()
         self.setSizePolicy(QSizePolicy.Policy.Maximum, QSizePolicy.Policy.Maximum)
 
+        self._lastItems = set()
         REGISTRY.itemsChanged.connect(self.onTransformerWidgetsChanged)
         self.onTransformerWidgetsChanged("widgets")
     
+    @Slot()
+    def onAddClicked(self) -> None:
+        """
+        Add the transformer widget that is selected in the transformer
+        selector.
+        """
+        self.onAdd(self.transformerSelector.currentText())
+
     @Slot()
     def onAdd(self, key: str) -> TransformerWidget:
         """
@@ -108,7 +174,7 @@ class PipelineWidget(QWidget):
         self._pipeline.append(widget.transformer)
         self.hTransformerLayout.addWidget(widget)
         widget.setParent(self)
-        widget.removed.connect(lambda: self.removeTransformerWidget(widget))
+        widget.removed.connect(self.removeTransformerWidget)
 
         return widget
 
@@ -123,19 +189,25 @@ class PipelineWidget(QWidget):
 
     @Slot(object)
     def onTransformerWidgetsChanged(self, category: str) -> None:
+        """
+        Update the transformer selector when the registered widgets change.
+        Only the items that were added or removed are changed in the selector.
+        """
         if category != "widgets":
             return
         
         items = REGISTRY.items("widgets")
-        newTransformerSelector = QComboBox(self)
-        self.hLayout.replaceWidget(self.transformerSelector, newTransformerSelector)
-        self.transformerSelector.deleteLater()
-        self.transformerSelector = newTransformerSelector
+        self.transformerWidgets = items
 
-        self.transformerWidgets = items.copy()
+        newItems = set(items)
+        for item in self._lastItems - newItems:
+            self.transformerSelector.removeItem(
+                self.transformerSelector.findText(item))
+        for item in items:
+            if item not in self._lastItems:
+                self.transformerSelector.addItem(item)
 
-        for i in items:
-            self.transformerSelector.addItem(i)
+        self._lastItems = newItems
 
     def pipeline(self) -> Pipeline:
         """
@@ -171,9 +243,10 @@ class PipelineWidget(QWidget):
 
         QWidget.close(self)
 
-class FrameProcessor(QRunnable, QObject):
+class FrameProcessor(QRunnable):
     """
-    Thread runnable that runs one transform.
+    Thread runnable that runs one transform. It emits no signals, so it does
+    not need to be a QObject.
     """
 
     def __init__(self, transformer: ITransformer, dryRun: bool = False) -> None:
@@ -181,12 +254,10 @@ class FrameProcessor(QRunnable, QObject):
         Initialize the frame processor to use some source and transformer.
         """
         QRunnable.__init__(self)
-        QObject.__init__(self)
 
         self.transformer = transformer
-        self.frameData = FrameData(dryRun=dryRun)
+        self.frameData = FRAME_DATA_POOL.acquire(dryRun=dryRun)
 
-    @Slot()
     def run(self) -> None:
         """
         Run the thread.
@@ -252,28 +323,71 @@ class ModularPoseProcessorWidget(QWidget):
         self.vLayout.addWidget(self.statusBar)
         self.statusBar.setSizePolicy(QSizePolicy.Policy.Maximum, QSizePolicy.Policy.Maximum)
 
-        self.qThreadPool = QThreadPool.globalInstance()
+        # The pipeline gets its own pool so frames do not queue up behind the
+        # long-running network clients in the global pool. A new frame enters
+        # the pipeline as soon as the first stage is cleared, so several
+        # frames are processed at once in different stages. Every stage,
+        # including the model, is still entered by one frame at a time, and
+        # frames cannot overtake each other.
+        self.qThreadPool = QThreadPool(self)
+        self.qThreadPool.setMaxThreadCount(min(PIPELINE_MAX_THREADS,
+                                               os.cpu_count() or 1))
         self.transformerHead = TransformerHead(
             self.pipelineWidget.pipeline(),
-            threadingModel=TransformerHead.MultiThreading.PER_FRAME)
-
-        self.pipelineWidget.imageProvider.frameReady.connect(self.showFrame)
-        self.pipelineWidget.frameDataProvider.frameDataReady.connect(self.setFrameData)
+            threadingModel=TransformerHead.MultiThreading.PER_STAGE,
+            qThreadPool=self.qThreadPool)
+
+        # Frames arriving faster than the screen refreshes are not drawn.
+        # Only the most recent of them is shown when the timer runs out.
+        refreshRate = self.screen().refreshRate()
+        self.displayTimer = QTimer(self)
+        self.displayTimer.setSingleShot(True)
+        self.displayTimer.setInterval(int(1000 / refreshRate) \
+                                      if refreshRate > 0 else 16)
+        self.displayTimer.timeout.connect(self.onDisplayTimeout)
+        self.pendingImage = None
+
+        # The slot updates widgets, so it must run in the ui thread. A direct
+        # connection would call it from the pipeline threads.
+        self.pipelineWidget.previewProvider.frameReady.connect(
+            self.onFrameReady, Qt.ConnectionType.QueuedConnection)
+        self.frameRate = 0
         self.lastFrameRate = 0
+        self.droppedFrames = 0
+        self.lastDroppedFrames = 0
         self.frameData = FrameData()
         self.latency = 0.1
         self.lastLatency = 0.1
 
+        # The labels are only updated once per interval with the latest values
+        # instead of for every frame.
+        self.labelTimer = QTimer(self)
+        self.labelTimer.setSingleShot(True)
+        self.labelTimer.setInterval(LABEL_UPDATE_INTERVAL)
+        self.labelTimer.timeout.connect(self.updateLabels)
+
         handler = StatusLogHandler()
         handler.messageEmitted.connect(self.statusBar.setText)
-        logging.getLogger().addHandler(handler.logHandler())
+        for loggerName in STATUS_LOGGERS:
+            logging.getLogger(loggerName).addHandler(handler.logHandler())
+
+    @Slot(object, FrameData)
+    def onFrameReady(self, qImage: Optional[QImage], frameData: FrameData) -> None:
+        """
+        Update the frame data and show the frame once it completed the pipeline.
+        """
+        self.setFrameData(frameData)
+        self.showFrame(qImage)
 
     def setFrameData(self, frameData: FrameData) -> None:
         """
-        Set the frame data to be used by the transformer head.
+        Set the frame data to be used by the transformer head. The previous
+        frame data has completed the pipeline and is returned to the pool.
         """
+        if self.frameData is not frameData:
+            FRAME_DATA_POOL.release(self.frameData)
         self.frameData = frameData
-        if "metrics" in frameData:
+        if "metrics" in frameData and self.metricsVisible():
             self.metricWidgets.updateMetrics(frameData["metrics"],
                                              minimumMetrics=frameData["metrics_min"] \
                                                 if "metrics_min" in frameData else None,
@@ -282,7 +396,9 @@ class ModularPoseProcessorWidget(QWidget):
                                              derivativeMetrics=frameData["metrics_derivatives"] \
                                                 if "metrics_derivatives" in frameData else None)
             
-        nextFrameRate = self.frameData.frameRate
+        self.frameRate = self.frameData.frameRate
+        self.droppedFrames = self.frameData["dropped_frames"] \
+            if "dropped_frames" in self.frameData else 0
 
         latency = time.time() - self.frameData["timings"][0][1]
         """
@@ -295,14 +411,33 @@ class ModularPoseProcessorWidget(QWidget):
         
         self.latency = (10 * self.latency + latency) / 11
 
+        if not self.labelTimer.isActive():
+            self.labelTimer.start()
+
+    @Slot()
+    def updateLabels(self) -> None:
+        """
+        Show the latest latency, frame rate and number of dropped frames if
+        they changed since the labels were last updated.
+        """
         if abs(self.latency - self.lastLatency) > 0.002:
             self.lastLatency = self.latency
             self.onLatencyUpdate(self.latency)
 
-        if nextFrameRate != self.lastFrameRate:
-            self.lastFrameRate = nextFrameRate
+        if self.frameRate != self.lastFrameRate \
+            or self.droppedFrames != self.lastDroppedFrames:
+            self.lastFrameRate = self.frameRate
+            self.lastDroppedFrames = self.droppedFrames
             self.onFrameRateUpdate(self.lastFrameRate)
 
+    def metricsVisible(self) -> bool:
+        """
+        Return whether the metric widgets can currently be seen. If they are
+        hidden or the window is minimized, there is no need to update the plots.
+        """
+        return self.metricWidgets.isVisible() \
+            and not self.window().isMinimized()
+
     def toggleRunning(self) -> None:
         """
         Toggle between the pipeline running and processing images and not
@@ -325,22 +460,49 @@ class ModularPoseProcessorWidget(QWidget):
     @Slot(np.ndarray)
     def showFrame(self, qImage: Optional[QImage]) -> None:
         """
-        If the qImage is not None, draw it to the application window.
+        If the qImage is not None, draw it to the application window. If a
+        frame has been drawn within the current display interval, the image is
+        kept and drawn once the interval is over.
         """
         if qImage is not None:
-            pixmap = QPixmap.fromImage(qImage)
-            self.displayLabel.setPixmap(pixmap)
+            if self.displayTimer.isActive():
+                self.pendingImage = qImage
+            else:
+                self.drawImage(qImage)
 
             if self.frameData.streamEnded:
                 self.toggleRunning()
-                
+
+    @Slot()
+    def onDisplayTimeout(self) -> None:
+        """
+        Draw the most recent frame that arrived during the display interval.
+        """
+        if self.pendingImage is not None:
+            qImage = self.pendingImage
+            self.pendingImage = None
+            self.drawImage(qImage)
+
+    def drawImage(self, qImage: QImage) -> None:
+        """
+        Draw the qImage to the application window and start a new display
+        interval.
+        """
+        pixmap = QPixmap.fromImage(qImage, PIXMAP_CONVERSION_FLAGS)
+        self.displayLabel.setPixmap(pixmap)
+        self.displayTimer.start()
 
     @Slot(int)
     def onFrameRateUpdate(self, frameRate: int) -> None:
         """
-        Update the label displaying the current frame rate.
+        Update the label displaying the current frame rate and the number of
+        frames that were dropped in the previous second.
         """
-        self.frameRateLabel.setText(f"FPS: {frameRate}")
+        if self.lastDroppedFrames > 0:
+            self.frameRateLabel.setText(
+                f"FPS: {frameRate} ({self.lastDroppedFrames} dropped)")
+        else:
+            self.frameRateLabel.setText(f"FPS: {frameRate}")
 
     @Slot(float)
     def onLatencyUpdate(self, latency: float) -> None:
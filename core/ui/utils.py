@@ -51,19 +51,19 @@ class CameraSelectorButton(QRadioButton):
         """
         if isChecked:
             camera = QCamera(self.cameraDevice)
-            formats = self.cameraDevice.videoFormats()
-            formats.sort(key=lambda f: f.resolution().height())
-            formats.sort(key=lambda f: f.resolution().width())
-            formats.sort(key=lambda f: f.maxFrameRate())
-
-            usable_formats = [f for f in formats
-                              if f.resolution().width() >= TARGET_FRAME_WIDTH
-                              and f.resolution().height() >= TARGET_FRAME_HEIGHT
-                              and f.maxFrameRate() >= TARGET_FRAME_RATE]
-            if len(usable_formats) == 0:
+            # Pick the usable format with the lowest frame rate, then width,
+            # then height in a single pass.
+            format = min((f for f in self.cameraDevice.videoFormats()
+                          if f.resolution().width() >= TARGET_FRAME_WIDTH
+                          and f.resolution().height() >= TARGET_FRAME_HEIGHT
+                          and f.maxFrameRate() >= TARGET_FRAME_RATE),
+                         key=lambda f: (f.maxFrameRate(),
+                                        f.resolution().width(),
+                                        f.resolution().height()),
+                         default=None)
+            if format is None:
                 module_logger.warn("No suitable video format exists")
             else:
-                format = usable_formats[0]
                 module_logger.info(f"Recording in {format.resolution().width()}x{format.resolution().height()}@{format.maxFrameRate()}")
                 camera.setCameraFormat(format)
 
@@ -134,9 +134,11 @@ class CameraSelector(QGroupBox):
 
 class ModelSelectorButton(QRadioButton):
     """
-    A Radio button that allows selection of one model.
+    A Radio button that allows selection of one model. The model is only
+    created when it is selected for the first time, so that models which are
+    never used are not loaded or downloaded.
     """
-    model: IModel
+    model: Optional[IModel]
     selected = Signal(IModel)
 
     def __init__(self, modelName: str) -> None:
@@ -145,15 +147,19 @@ class ModelSelectorButton(QRadioButton):
         """
         QRadioButton.__init__(self, modelName)
 
-        self.model = REGISTRY.createItem(modelName)
+        self.modelName = modelName
+        self.model = None
         self.toggled.connect(self.slotSelected)
 
     @Slot()
     def slotSelected(self) -> None:
         """
-        Propagate the signal if the model has been selected.
+        Create the model if necessary and propagate the signal if the model
+        has been selected.
         """
         if self.isChecked():
+            if self.model is None:
+                self.model = REGISTRY.createItem(self.modelName)
             self.selected.emit(self.model)
 
 class ModelSelector(QGroupBox):
@@ -1,6 +1,5 @@
 import numpy as np
-import tensorflow as tf
-import tensorflow_hub as hub
+import cv2
 import mediapipe as mp
 import mediapipe.python.solutions.pose as mp_pose
 from mediapipe.tasks import python
@@ -13,6 +12,20 @@ from core.keypoint_sets.IKeyPointSet import IKeypointSet
 from core.keypoint_sets.SimpleyKeypointSet import SimpleKeypointSet
 from core.models.IModel import IModel
 
+def resizeInto(image: np.ndarray, buffer: np.ndarray) -> np.ndarray:
+    """
+    Resize the image to the size of the preallocated uint8 buffer and write
+    the result into it, so that no input array is allocated per frame.
+    """
+    if image.dtype != np.uint8:
+        image = image.astype(np.uint8)
+    cv2.resize(image,
+               (buffer.shape[1], buffer.shape[0]),
+               dst=buffer,
+               interpolation=cv2.INTER_LINEAR)
+
+    return buffer
+
 class BlazePose(IModel):
     """
     The BlazePose Model from MediaPipe in Full flavor.
@@ -23,6 +36,7 @@ class BlazePose(IModel):
                      min_tracking_confidence=0.5,
                      static_image_mode=False)
         self.inputSize = 256
+        self.input = np.empty((self.inputSize, self.inputSize, 3), dtype=np.uint8)
     
     def detect(self, image: np.ndarray) -> IKeypointSet:
         """
@@ -31,8 +45,7 @@ class BlazePose(IModel):
 
         image - the image to analyze.
         """
-        image = tf.image.resize(image, (self.inputSize, self.inputSize))
-        image = tf.cast(image, dtype=np.uint8).numpy()
+        image = resizeInto(image, self.input)
 
         output = self.blazePose.process(image).pose_landmarks
 
@@ -107,10 +120,10 @@ class BlazePoseHeavy(IModel):
             output_segmentation_masks=True)
         self.detector = vision.PoseLandmarker.create_from_options(options)
         self.inputSize = 224
+        self.input = np.empty((self.inputSize, self.inputSize, 3), dtype=np.uint8)
 
     def detect(self, image: np.ndarray) -> IKeypointSet:
-        image = tf.image.resize(image, (self.inputSize, self.inputSize))
-        image = tf.cast(image, dtype=np.uint8).numpy()
+        image = resizeInto(image, self.input)
         image = mp.Image(image_format=mp.ImageFormat.SRGB, data=image)
 
         output = self.detector.detect(image).pose_landmarks
@@ -135,11 +148,11 @@ class BlazePoseLite(IModel):
             running_mode=VisionRunningMode.VIDEO)
         self.detector = vision.PoseLandmarker.create_from_options(options)
         self.inputSize = 224
+        self.input = np.empty((self.inputSize, self.inputSize, 3), dtype=np.uint8)
         self.timeline = 0
 
     def detect(self, image: np.ndarray) -> IKeypointSet:
-        image = tf.image.resize(image, (self.inputSize, self.inputSize))
-        image = tf.cast(image, dtype=np.uint8).numpy()
+        image = resizeInto(image, self.input)
         image = mp.Image(image_format=mp.ImageFormat.SRGB, data=image)
 
         output = self.detector.detect_for_video(image, self.timeline).pose_landmarks
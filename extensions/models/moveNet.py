@@ -1,7 +1,9 @@
 import numpy as np
 import tensorflow as tf
+import cv2
 import tensorflow_hub as hub
 
+from core.resource_management.registry import REGISTRY
 from core.models.IModel import IModel
 from core.keypoint_sets.IKeyPointSet import IKeypointSet
 from core.keypoint_sets.SimpleyKeypointSet import SimpleKeypointSet
@@ -18,7 +20,18 @@ class MoveNetLightning(IModel):
         module = hub.load("https://tfhub.dev/google/movenet/singlepose/lightning/4")
         self.inputSize = 192
         self.movenet = module.signatures['serving_default']
-            
+        self._infer = tf.function(self._run, reduce_retracing=True)
+
+    def _run(self, image: tf.Tensor) -> tf.Tensor:
+        """
+        Preprocess the image and run the model. Traced into one graph, so
+        that each frame is a single call instead of one per operation.
+        """
+        image = tf.expand_dims(image, axis=0)
+        image = tf.image.resize(image, (self.inputSize, self.inputSize))
+        image = tf.cast(image, dtype=tf.int32)
+
+        return self.movenet(image)["output_0"][0, 0]
 
     def detect(self, image: np.ndarray) -> IKeypointSet:
         """
@@ -27,11 +40,7 @@ class MoveNetLightning(IModel):
 
         image - the image to analyze.
         """
-        image = tf.expand_dims(image, axis=0)
-        image = tf.image.resize(image, (self.inputSize, self.inputSize))
-        image = tf.cast(image, dtype=np.int32)
-
-        output = self.movenet(image)["output_0"].numpy()[0, 0].tolist()
+        output = self._infer(image).numpy().tolist()
 
         return SimpleKeypointSet(output, [])
     
@@ -50,7 +59,18 @@ class MoveNetThunder(IModel):
         module = hub.load("https://tfhub.dev/google/movenet/singlepose/thunder/4")
         self.inputSize = 256
         self.movenet = module.signatures['serving_default']
-            
+        self._infer = tf.function(self._run, reduce_retracing=True)
+
+    def _run(self, image: tf.Tensor) -> tf.Tensor:
+        """
+        Preprocess the image and run the model. Traced into one graph, so
+        that each frame is a single call instead of one per operation.
+        """
+        image = tf.expand_dims(image, axis=0)
+        image = tf.image.resize(image, (self.inputSize, self.inputSize))
+        image = tf.cast(image, dtype=tf.int32)
+
+        return self.movenet(image)["output_0"][0, 0]
 
     def detect(self, image: np.ndarray) -> IKeypointSet:
         """
@@ -59,13 +79,98 @@ class MoveNetThunder(IModel):
 
         image - the image to analyze.
         """
-        image = tf.expand_dims(image, axis=0)
-        image = tf.image.resize(image, (self.inputSize, self.inputSize))
-        image = tf.cast(image, dtype=np.int32)
-
-        output = self.movenet(image)["output_0"].numpy()[0, 0].tolist()
+        output = self._infer(image).numpy().tolist()
 
         return SimpleKeypointSet(output, [])
     
     def __str__(self) -> str:
-        return "MoveNet (Thunder)"
\ No newline at end of file
+        return "MoveNet (Thunder)"
+
+class MoveNetLite(IModel):
+    """
+    The MoveNet Model as a TFLite release with reduced precision. float16
+    halves the size of the weights, int8 runs considerably faster than the
+    float model on CPUs with int8 dot product instructions. Both come at a
+    small loss in accuracy.
+    """
+    def __init__(self, flavor: str, precision: str) -> None:
+        """
+        Initialize the model by downloading the TFLite model from tensorflow
+        hub and loading it into a TFLite interpreter.
+
+        flavor - either "lightning" or "thunder".
+        precision - either "float16" or "int8".
+        """
+        self.flavor = flavor
+        self.precision = precision
+        modelPath = tf.keras.utils.get_file(
+            f"movenet_singlepose_{flavor}_{precision}_4.tflite",
+            f"https://tfhub.dev/google/lite-model/movenet/singlepose/{flavor}/tflite/{precision}/4?lite-format=tflite")
+        self.interpreter = tf.lite.Interpreter(model_path=modelPath)
+        self.interpreter.allocate_tensors()
+        self.inputDetails = self.interpreter.get_input_details()[0]
+        self.outputDetails = self.interpreter.get_output_details()[0]
+        self.inputSize = self.inputDetails["shape"][1]
+        self.input = np.empty(self.inputDetails["shape"],
+                              dtype=self.inputDetails["dtype"])
+
+    def detect(self, image: np.ndarray) -> IKeypointSet:
+        """
+        Detect the pose in the given image. The image has to have dimensions
+        (height, width, channels).
+
+        image - the image to analyze.
+        """
+        if image.dtype != self.input.dtype:
+            image = image.astype(self.input.dtype)
+        cv2.resize(image,
+                   (self.inputSize, self.inputSize),
+                   dst=self.input[0],
+                   interpolation=cv2.INTER_LINEAR)
+
+        self.interpreter.set_tensor(self.inputDetails["index"], self.input)
+        self.interpreter.invoke()
+        output = self.interpreter.get_tensor(self.outputDetails["index"])[0, 0].tolist()
+
+        return SimpleKeypointSet(output, [])
+
+    def __str__(self) -> str:
+        return f"MoveNet ({self.flavor.capitalize()}, {self.precision})"
+
+
+class MoveNetLightningInt8(MoveNetLite):
+    """
+    The MoveNet Model in lightning flavor, quantized to int8.
+    """
+    def __init__(self) -> None:
+        MoveNetLite.__init__(self, "lightning", "int8")
+
+
+class MoveNetLightningFloat16(MoveNetLite):
+    """
+    The MoveNet Model in lightning flavor with float16 weights.
+    """
+    def __init__(self) -> None:
+        MoveNetLite.__init__(self, "lightning", "float16")
+
+
+class MoveNetThunderInt8(MoveNetLite):
+    """
+    The MoveNet Model in thunder flavor, quantized to int8.
+    """
+    def __init__(self) -> None:
+        MoveNetLite.__init__(self, "thunder", "int8")
+
+
+class MoveNetThunderFloat16(MoveNetLite):
+    """
+    The MoveNet Model in thunder flavor with float16 weights.
+    """
+    def __init__(self) -> None:
+        MoveNetLite.__init__(self, "thunder", "float16")
+
+
+REGISTRY.register(MoveNetLightningInt8, "models.MoveNet (Lightning, int8)")
+REGISTRY.register(MoveNetLightningFloat16, "models.MoveNet (Lightning, float16)")
+REGISTRY.register(MoveNetThunderInt8, "models.MoveNet (Thunder, int8)")
+REGISTRY.register(MoveNetThunderFloat16, "models.MoveNet (Thunder, float16)")
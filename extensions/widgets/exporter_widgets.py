@@ -119,9 +119,9 @@ class VideoExporterWidget(ExporterWidget):
         """
         Unload the exporter and save the video.
         """
+        self.recorderTransformer.setVideoRecorder(None)
         if self.videoRecorder is not None:
             self.videoRecorder.close()
-        self.recorderTransformer.setVideoRecorder(None)
         
     def transformer(self) -> None:
         """
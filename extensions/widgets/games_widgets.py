@@ -168,6 +168,9 @@ class PongServerWidget(TransformerWidget):
         self.orientationButtonGroup.buttonClicked.connect(
             lambda btn: self.transformer.setOrientation(btn.text().upper()))
         self.orientationLeft.setChecked(True)
+        self.orientationButtons = {
+            button.text(): button for button in self.orientationButtonGroup.buttons()
+        }
 
         self.paddleGroup = QGroupBox("Paddle", self)
         self.hPaddleLayout = QHBoxLayout()
@@ -191,6 +194,9 @@ class PongServerWidget(TransformerWidget):
         self.paddleButtonGroup.buttonClicked.connect(
             lambda btn: self.transformer.setPaddle(btn.text().upper()))
         self.orientationLeft.setChecked(True)
+        self.paddleButtons = {
+            button.text(): button for button in self.paddleButtonGroup.buttons()
+        }
         
 
     def setClient(self, client: Client) -> None:
@@ -230,32 +236,15 @@ class PongServerWidget(TransformerWidget):
         TransformerWidget.save(self, d)
         self.metricSelector.restore(d)
         
-        if "orientation" in d:
+        if "orientation" in d and d["orientation"] in self.orientationButtons:
             orientation = d["orientation"]
-            if orientation == "left":
-                self.orientationLeft.setChecked(True)
-                self.transformer.setOrientation("LEFT")
-            elif orientation == "right":
-                self.orientationRight.setChecked(True)
-                self.transformer.setOrientation("RIGHT")
-            elif orientation == "bottom":
-                self.orientationBottom.setChecked(True)
-                self.transformer.setOrientation("BOTTOM")
+            self.orientationButtons[orientation].setChecked(True)
+            self.transformer.setOrientation(orientation.upper())
         
-        if "paddle" in d:
+        if "paddle" in d and d["paddle"] in self.paddleButtons:
             paddle = d["paddle"]
-            if paddle == "left":
-                self.paddleLeft.setChecked(True)
-                self.transformer.setPaddle("LEFT")
-            elif paddle == "right":
-                self.paddleRight.setChecked(True)
-                self.transformer.setPaddle("RIGHT")
-            elif paddle == "top":
-                self.paddleTop.setChecked(True)
-                self.transformer.setPaddle("TOP")
-            elif paddle == "bottom":
-                self.paddleBottom.setChecked(True)
-                self.transformer.setPaddle("BOTTOM")
+            self.paddleButtons[paddle].setChecked(True)
+            self.transformer.setPaddle(paddle.upper())
 
     def __str__(self) -> str:
         return "Pong Server"
@@ -5,13 +5,14 @@ Author: Henrik Zimmermann <henrik.zimmermann@utoronto.ca>
 """
 
 from __future__ import annotations
+from functools import partial
 import os
 from typing import Optional
 
 import logging
 
 from PySide6.QtWidgets import QWidget, QLabel, QVBoxLayout, QLineEdit, \
-    QPushButton, QSlider, QHBoxLayout, QColorDialog, QComboBox
+    QPushButton, QSlider, QHBoxLayout, QColorDialog, QComboBox, QCheckBox
 from PySide6.QtCore import Slot, Qt
 from PySide6.QtGui import QColor
 
@@ -22,7 +23,7 @@ from core.resource_management.video.QVideoSource import QVideoSource
 
 from core.transformers.transformers import BackgroundRemover, ButterworthTransformer, \
     CsvImporter, DerivativeTransformer, ImageMirror, LandmarkDrawer, \
-        MetricTransformer, MinMaxTransformer, ModelRunner, \
+        MetricTransformer, MinMaxTransformer, ModelRunner, OneEuroFilter, \
             Scaler, SkeletonDrawer, SlidingAverageTransformer, \
                 VideoSourceTransformer
 from core.transformers.Pipeline import Pipeline
@@ -38,7 +39,8 @@ module_logger.setLevel(logging.DEBUG)
 class ScalerWidget(TransformerWidget):
     """
     Scales an image to a square size using padding to keep the frame from
-    tearing. Requires a frame source before it.
+    tearing. Can mirror the image in the same pass instead of using a separate
+    mirror. Requires a frame source before it.
     """
     transformer: Scaler
 
@@ -58,6 +60,10 @@ class ScalerWidget(TransformerWidget):
         self.applyButton.clicked.connect(self.onApplyClicked)
         self.vLayout.addWidget(self.applyButton)
 
+        self.mirrorCheckBox = QCheckBox("Mirror", self)
+        self.mirrorCheckBox.toggled.connect(self.transformer.setMirrored)
+        self.vLayout.addWidget(self.mirrorCheckBox)
+
     @Slot()
     def onApplyClicked(self) -> None:
         """
@@ -73,6 +79,7 @@ class ScalerWidget(TransformerWidget):
         """
         TransformerWidget.save(self, d)
         d["height"] = int(self.heightSelector.text())
+        d["mirror"] = self.mirrorCheckBox.isChecked()
 
     def restore(self, d: dict) -> None:
         """
@@ -80,6 +87,7 @@ class ScalerWidget(TransformerWidget):
         """
         TransformerWidget.restore(self, d)
         self.heightSelector.setText(str(d["height"]))
+        self.mirrorCheckBox.setChecked(d.get("mirror", False))
 
 
 class ImageMirrorWidget(TransformerWidget):
@@ -123,12 +131,18 @@ class ModelRunnerWidget(TransformerWidget):
         self.modelSelector.modelSelected.connect(self.modelTransformer.setModel)
         self.vLayout.addWidget(self.modelSelector)
 
+        self.reuseDetectionsCheckBox = QCheckBox("Reuse detections on still frames", self)
+        self.reuseDetectionsCheckBox.toggled.connect(
+            self.modelTransformer.setReuseDetections)
+        self.vLayout.addWidget(self.reuseDetectionsCheckBox)
+
     def save(self, d: dict) -> None:
         """
         Save the widget state to the given dictionary.
         """
         TransformerWidget.save(self, d)
         d["model"] = self.modelSelector.selectedModel()
+        d["reuseDetections"] = self.reuseDetectionsCheckBox.isChecked()
 
     def restore(self, d: dict) -> None:
         """
@@ -136,6 +150,7 @@ class ModelRunnerWidget(TransformerWidget):
         """
         TransformerWidget.restore(self, d)
         self.modelSelector.setSelectedModel(d["model"])
+        self.reuseDetectionsCheckBox.setChecked(d.get("reuseDetections", False))
 
 
 class LandmarkDrawerWidget(TransformerWidget):
@@ -303,7 +318,7 @@ class ExporterTransformerWidget(TransformerWidget):
         """
         Add an exporter to the display.
         """
-        exporter.removed.connect(lambda: self.removeExporter(exporter))
+        exporter.removed.connect(partial(self.removeExporter, exporter))
         self.exporters.append(exporter)
         self.vExportersLayout.addWidget(exporter)
 
@@ -436,6 +451,17 @@ class VideoSourceWidget(TransformerWidget):
                                          defaultPath=defaultPath)
         self.vLayout.addWidget(self.fileSelector)
 
+        self.frameStrideLabel = QLabel("Frame Stride", self)
+        self.vLayout.addWidget(self.frameStrideLabel)
+
+        self.frameStrideSlider = LabeledQSlider(self,
+                                                orientation=Qt.Orientation.Horizontal)
+        self.frameStrideSlider.setMinimum(1)
+        self.frameStrideSlider.setMaximum(10)
+        self.frameStrideSlider.setTickPosition(QSlider.TickPosition.TicksBelow)
+        self.frameStrideSlider.setTickInterval(1)
+        self.vLayout.addWidget(self.frameStrideSlider)
+
         self.csvImporterLayout = QVBoxLayout()
         self.vLayout.addLayout(self.csvImporterLayout)
 
@@ -464,22 +490,28 @@ class VideoSourceWidget(TransformerWidget):
                                 defaultPath=defaultPath)
         self.selectors.append(selector)
 
-        def remove() -> None:
-            self.selectors.remove(selector)
-            self.csvImporterLayout.removeWidget(selector)
-            selector.deleteLater()
-
-        selector.removeButton.clicked.connect(remove)
+        selector.removeButton.clicked.connect(
+            partial(self.removeImporter, selector))
         self.csvImporterLayout.addWidget(selector)
 
+    def removeImporter(self, selector: FileSelector) -> None:
+        """
+        Remove a csv importer selector from the widget.
+        """
+        self.selectors.remove(selector)
+        self.csvImporterLayout.removeWidget(selector)
+        selector.deleteLater()
+
     @Slot()
     def load(self) -> None:
         """
         Load the video by creating the appropriate video file source object
-        and setting it in the transformer.
+        and setting it in the transformer. Only every n-th frame is decoded
+        and imported, where n is the selected frame stride.
         """
         filename = self.fileSelector.selectedFile()
-        self.videoSource = CVVideoFileSource(filename)
+        frameStride = self.frameStrideSlider.value()
+        self.videoSource = CVVideoFileSource(filename, frameStride)
         if self.videoSourceTransformer.videoSource is not None:
             self.videoSourceTransformer.videoSource.close()
         self.videoSourceTransformer.setVideoSource(self.videoSource)
@@ -491,6 +523,7 @@ class VideoSourceWidget(TransformerWidget):
 
         for selector in self.selectors:
             importer = CsvImporter(33)
+            importer.setFrameStride(frameStride)
             file = open(selector.selectedFile(), "r", newline="")
             importer.setFile(file)
             self.transformer.append(importer)
@@ -547,6 +580,62 @@ class ButterworthWidget(TransformerWidget):
         self.transformer = ButterworthTransformer()
     
     
+class OneEuroFilterWidget(TransformerWidget):
+    """
+    Smoothes out the keypoint positions using a One-Euro filter. Requires a
+    model before it. The sliders are in tenths of their values.
+    """
+    transformer: OneEuroFilter
+
+    def __init__(self,
+                 parent: Optional[QWidget] = None) -> None:
+        """
+        Initialize it.
+        """
+        TransformerWidget.__init__(self, "One-Euro Filter", parent)
+        self.transformer = OneEuroFilter()
+
+        self.minCutoffLabel = QLabel("Minimum Cutoff (Hz)", self)
+        self.vLayout.addWidget(self.minCutoffLabel)
+
+        self.minCutoffSlider = LabeledQSlider(self,
+                                              orientation=Qt.Orientation.Horizontal)
+        self.minCutoffSlider.setMinimum(1)
+        self.minCutoffSlider.setMaximum(50)
+        self.minCutoffSlider.setValue(round(10 * self.transformer.minCutoff))
+        self.minCutoffSlider.valueChanged.connect(
+            lambda value: self.transformer.setMinCutoff(value / 10))
+        self.vLayout.addWidget(self.minCutoffSlider)
+
+        self.betaLabel = QLabel("Speed Coefficient", self)
+        self.vLayout.addWidget(self.betaLabel)
+
+        self.betaSlider = LabeledQSlider(self,
+                                         orientation=Qt.Orientation.Horizontal)
+        self.betaSlider.setMinimum(0)
+        self.betaSlider.setMaximum(100)
+        self.betaSlider.setValue(round(10 * self.transformer.beta))
+        self.betaSlider.valueChanged.connect(
+            lambda value: self.transformer.setBeta(value / 10))
+        self.vLayout.addWidget(self.betaSlider)
+
+    def save(self, d: dict) -> None:
+        """
+        Save the widget state to the given dictionary.
+        """
+        TransformerWidget.save(self, d)
+        d["minCutoff"] = self.minCutoffSlider.value()
+        d["beta"] = self.betaSlider.value()
+
+    def restore(self, d: dict) -> None:
+        """
+        Restore the widget state from the given dictionary.
+        """
+        TransformerWidget.restore(self, d)
+        self.minCutoffSlider.setValue(d["minCutoff"])
+        self.betaSlider.setValue(d["beta"])
+
+
 class MinMaxWidget(TransformerWidget):
     """
     Injects minimum and maximum into the frame data object. Requires a metrics
@@ -634,5 +723,6 @@ REGISTRY.register(ExporterTransformerWidget, "widgets.Exporter")
 REGISTRY.register(MetricViewWidget, "widgets.Metrics")
 REGISTRY.register(SlidingAverageWidget, "widgets.Sliding Average")
 REGISTRY.register(ButterworthWidget, "widgets.Butterworth Filter")
+REGISTRY.register(OneEuroFilterWidget, "widgets.One-Euro Filter")
 REGISTRY.register(MinMaxWidget, "widgets.Min/Max Selector")
 REGISTRY.register(DerivativeWidget, "widgets.Derivatives")
@@ -160,18 +160,18 @@ class PongClient(ITransformerStage, QObject):
 
             frameData["metrics"]["target"] = target
 
+            send = client.send
             if self.mode == "absolute":
-                event = Event("moveTo", [target])
-                client.send(event)
+                send(Event("moveTo", [target]))
             elif self.mode == "threshold":
                 if target > 0.8:
-                    client.send(Event("moveUp"))
+                    send(Event("moveUp"))
                 elif target < 0.2:
-                    client.send(Event("moveDown"))
+                    send(Event("moveDown"))
                 else:
-                    client.send(Event("neutral"))
+                    send(Event("neutral"))
             elif self.mode == "speed":
-                client.send(Event("setSpeed", [2 * target - 1.0]))
+                send(Event("setSpeed", [2 * target - 1.0]))
 
             events = []
             while not self.events.empty():
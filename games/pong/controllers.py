@@ -6,8 +6,11 @@ Author: Henrik Zimmermann <henrik.zimmermann@utoronto.ca>
 """
 
 from __future__ import annotations
+from collections import deque
+from typing import Optional
 
 import logging
+import time
 
 from PySide6.QtWidgets import QWidget, QFormLayout
 from PySide6.QtCore import Qt
@@ -19,6 +22,10 @@ from core.ui.utils import LabeledQSlider
 module_logger = logging.getLogger(__name__)
 module_logger.setLevel(logging.DEBUG)
 
+# The minimum time in seconds between two ball speed changes sent to the
+# server. Changes requested in between are coalesced into the latest one.
+BALL_SPEED_SEND_INTERVAL = 0.05
+
 class PongController:
     """
     Interface for all the pong controllers.
@@ -155,6 +162,10 @@ class SimplePongController(PongController):
         self._higherCutoff = 0.6
         self._speedDelta = 0.2
         self._widget = None
+        self._pendingBallSpeed = None
+        self._lastBallSpeedSent = None
+        self._lastBallSpeedSendTime = 0.0
+        self._lastGameState = None
 
     def widget(self) -> SimplePongControllerWidget:
         if self._widget is None:
@@ -197,31 +208,73 @@ class SimplePongController(PongController):
         Return the speed delta.
         """
         return self._speedDelta
+
+    def setBallSpeed(self, client: Client, ballSpeed: float) -> None:
+        """
+        Request a new ball speed. It replaces any request that has not been
+        sent yet and is sent once the send interval has passed.
+        """
+        self._pendingBallSpeed = ballSpeed
+        self.flushBallSpeed(client)
+
+    def flushBallSpeed(self,
+                       client: Client,
+                       ballSpeed: Optional[float] = None) -> None:
+        """
+        Send the pending ball speed if the send interval has passed since the
+        last one was sent. Speeds equal to the last sent one are dropped
+        until the game reports that it reached that speed.
+
+        ballSpeed - the current ball speed reported by the game, if known.
+        """
+        if ballSpeed is not None and ballSpeed == self._lastBallSpeedSent:
+            self._lastBallSpeedSent = None
+
+        if self._pendingBallSpeed is None:
+            return
+
+        now = time.monotonic()
+        if now - self._lastBallSpeedSendTime < BALL_SPEED_SEND_INTERVAL:
+            return
+
+        if self._pendingBallSpeed != self._lastBallSpeedSent:
+            client.send(Event("setBallSpeed", [self._pendingBallSpeed]))
+            self._lastBallSpeedSent = self._pendingBallSpeed
+            self._lastBallSpeedSendTime = now
+        self._pendingBallSpeed = None
     
     def control(self, pongData: dict[str, object]):
         """
         Control the game based on the pong data.
         """
-        if "client" not in pongData or pongData["client"] is None:
+        client: Optional[Client] = pongData.get("client")
+        if client is None:
             return
-        
-        client: Client = pongData["client"]
-
-        if "selfHits" in pongData \
-            and "selfMisses" in pongData \
-                and pongData['selfHits'] + pongData['selfMisses'] > 0 \
-                    and "ballSpeed" in pongData:
-            accuracy = pongData["selfHits"] / \
-                (pongData["selfHits"] + pongData["selfMisses"])
+
+        ballSpeed = pongData.get("ballSpeed")
+        self.flushBallSpeed(client, ballSpeed)
+
+        hits = pongData.get("selfHits")
+        misses = pongData.get("selfMisses")
+
+        # Nothing to adapt if the game did not change since the last call
+        gameState = (hits, misses, ballSpeed)
+        if gameState == self._lastGameState:
+            return
+        self._lastGameState = gameState
+
+        if hits is not None and misses is not None and hits + misses > 0 \
+            and ballSpeed is not None:
+            accuracy = hits / (hits + misses)
             
-            if accuracy > self.higherCutoff():
-                newSpeed = pongData["ballSpeed"] + self.speedDelta()
-                client.send(Event("setBallSpeed", [newSpeed]))
-                module_logger.debug(f"Increased pong speed to {newSpeed}")
-            elif accuracy < self.lowerCutoff():
-                newSpeed = pongData["ballSpeed"] - self.speedDelta()
-                client.send(Event("setBallSpeed", [newSpeed]))
-                module_logger.debug(f"Decreased pong speed to {newSpeed}")
+            if accuracy > self._higherCutoff:
+                newSpeed = ballSpeed + self._speedDelta
+                self.setBallSpeed(client, newSpeed)
+                module_logger.debug("Increased pong speed to %s", newSpeed)
+            elif accuracy < self._lowerCutoff:
+                newSpeed = ballSpeed - self._speedDelta
+                self.setBallSpeed(client, newSpeed)
+                module_logger.debug("Decreased pong speed to %s", newSpeed)
 
     
     def save(self, d: dict) -> None:
@@ -247,7 +300,8 @@ class WindowedPongController(SimplePongController):
         self._windowLength = 5
         self._lastMiss = 0
         self._lastHit = 0
-        self.history = []
+        self.history = deque(maxlen=self._windowLength)
+        self._hitCount = 0
 
     def widget(self) -> WindowedPongControllerWidget:
         if self._widget is None:
@@ -262,55 +316,74 @@ class WindowedPongController(SimplePongController):
         if windowLength < 1:
             windowLength = 1
         self._windowLength = windowLength
+        self.history = deque(self.history, maxlen=int(windowLength))
+        self._hitCount = sum(self.history)
     
     def windowLength(self) -> float:
         """
         Return the window.
         """
         return self._windowLength
+
+    def recordInteraction(self, hit: int) -> None:
+        """
+        Add a hit (1) or miss (0) to the history and keep the number of hits
+        in the window up to date.
+        """
+        if len(self.history) == self.history.maxlen:
+            self._hitCount -= self.history[0]
+        self.history.append(hit)
+        self._hitCount += hit
+
+    def clearHistory(self) -> None:
+        """
+        Forget all hits and misses in the window.
+        """
+        self.history.clear()
+        self._hitCount = 0
     
     def control(self, pongData: dict[str, object]):
         """
         Control the game based on the pong data.
         """
-        if "client" not in pongData or pongData["client"] is None:
+        client: Optional[Client] = pongData.get("client")
+        if client is None:
             return
-        client: Client = pongData["client"]
+        ballSpeed = pongData.get("ballSpeed")
+        self.flushBallSpeed(client, ballSpeed)
 
-        if "events" not in pongData:
+        events: Optional[list[Event]] = pongData.get("events")
+        if events is None:
             return
-        events: list[Event] = pongData["events"]
+        orientation = pongData.get("orientation")
         ballInteraction = False
         
         for e in events:
-            if e.payload[0] == pongData["orientation"]:
+            if e.payload[0] == orientation:
                 ballInteraction = True
                 if e.name == "hit":
-                    self.history.append(1)
+                    self.recordInteraction(1)
                     module_logger.debug("Registered hit for pong controller")
                 elif e.name == "miss":
                     module_logger.debug("Registered miss for pong controller")
-                    self.history.append(0)
+                    self.recordInteraction(0)
 
         if ballInteraction:
-            while len(self.history) > self._windowLength:
-                self.history.pop(0)
-            
             if len(self.history) == 0: return
 
-            accuracy = sum(self.history) / len(self.history)
+            accuracy = self._hitCount / len(self.history)
 
             if len(self.history) == self._windowLength:
-                if accuracy > self.higherCutoff():
-                    newSpeed = pongData["ballSpeed"] + self.speedDelta()
-                    client.send(Event("setBallSpeed", [newSpeed]))
-                    module_logger.debug(f"Increased pong speed to {newSpeed}")
-                    self.history = []
-                elif accuracy < self.lowerCutoff():
-                    newSpeed = pongData["ballSpeed"] - self.speedDelta()
-                    client.send(Event("setBallSpeed", [newSpeed]))
-                    module_logger.debug(f"Decreased pong speed to {newSpeed}")
-                    self.history = []
+                if accuracy > self._higherCutoff:
+                    newSpeed = ballSpeed + self._speedDelta
+                    self.setBallSpeed(client, newSpeed)
+                    module_logger.debug("Increased pong speed to %s", newSpeed)
+                    self.clearHistory()
+                elif accuracy < self._lowerCutoff:
+                    newSpeed = ballSpeed - self._speedDelta
+                    self.setBallSpeed(client, newSpeed)
+                    module_logger.debug("Decreased pong speed to %s", newSpeed)
+                    self.clearHistory()
 
 
 #REGISTRY.register(SimplePongController, "pong_controllers.SimplePongController")
@@ -151,6 +151,7 @@ if __name__ == "__main__":
 
     module_logger.debug("Waiting for all threads to finish")
     start = time.time()
+    modularPoseProcessor.qThreadPool.waitForDone()
     QThreadPool.globalInstance().waitForDone()
     elapsed = time.time() - start
     module_logger.debug(f"Threads all finished ({int(1000 * elapsed)}ms)")
@@ -0,0 +1,66 @@
+import io
+
+from core.transformers.transformers import CsvImporter, OneEuroFilter, \
+    pixelCoordinates
+from core.transformers.utils import FrameData
+from extensions.models.mediapipe import BlazePose
+
+
+def importFrame(importer: CsvImporter) -> list[list[float]]:
+    """
+    Run one frame through the importer and return its keypoints.
+    """
+    frameData = FrameData()
+    importer.flowLock()
+    importer.transform(frameData)
+    return frameData.keypointSets[0].getKeypoints()
+
+
+def test_csv_importer_keeps_frames_aligned_after_truncated_row():
+    rows = [
+        "0.1,0.1,0.1,1.0",
+        "0.2,0.2",
+        "0.3,0.3,0.3,1.0",
+        "0.4,0.4,0.4,1.0",
+    ]
+    importer = CsvImporter(2)
+    importer.setFile(io.StringIO("\n".join(rows) + "\n"))
+
+    assert importFrame(importer) == [[0.1, 0.1, 0.1, 1.0],
+                                     [0.2, 0.2, 0.0, 0.0]]
+    assert importFrame(importer) == [[0.3, 0.3, 0.3, 1.0],
+                                     [0.4, 0.4, 0.4, 1.0]]
+
+
+def test_csv_importer_pads_last_frame_to_row_width():
+    rows = [
+        "0.1,0.1,0.1,1.0",
+        "0.2,0.2,0.2,1.0",
+        "0.3,0.3,0.3,1.0",
+    ]
+    importer = CsvImporter(2)
+    importer.setFile(io.StringIO("\n".join(rows) + "\n"))
+
+    importFrame(importer)
+    assert importFrame(importer) == [[0.3, 0.3, 0.3, 1.0],
+                                     [0.0, 0.0, 0.0, 0.0]]
+
+
+def test_pixel_coordinates_accepts_mixed_width_keypoints():
+    keypoints = [[0.5, 0.25], [0.5, 0.25, 0.0, 1.0], [1.0, 0.0, 0.0]]
+
+    assert pixelCoordinates(keypoints, 100, 200).tolist() \
+        == [[25, 100], [25, 100], [0, 200]]
+
+
+def test_one_euro_filter_accepts_ragged_keypoints_and_count_changes():
+    filter = OneEuroFilter()
+    for keypoints in ([[0.5, 0.5, 0.0, 1.0], [0.5, 0.5]],
+                      [[0.6, 0.6, 0.0, 1.0], [0.6, 0.6]],
+                      [[0.7, 0.7, 0.0]]):
+        frameData = FrameData(frameRate=30)
+        frameData.keypointSets.append(BlazePose.KeypointSet(keypoints))
+        filter.flowLock()
+        filter.transform(frameData)
+
+    assert frameData.keypointSets[0].getKeypoints() == [[0.7, 0.7, 0.0]]
@@ -0,0 +1,25 @@
+import gc
+
+import numpy as np
+
+from core.transformers.utils import FrameData
+
+
+class Owner:
+    pass
+
+
+def test_frame_data_buffers_are_owned_by_their_stage():
+    frameData = FrameData()
+    first, second = Owner(), Owner()
+
+    buffer = frameData.buffer(first, (2, 2), np.uint8)
+    assert frameData.buffer(first, (2, 2), np.uint8) is buffer
+    assert frameData.buffer(second, (2, 2), np.uint8) is not buffer
+
+    frameData.reset()
+    assert frameData.buffer(first, (2, 2), np.uint8) is buffer
+
+    del first, buffer
+    gc.collect()
+    assert len(frameData._buffers) == 1